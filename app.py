@@ -1,6 +1,6 @@
 import streamlit as st
 import numpy as np
-import random
+import os
 
 from src.utils import *
 from src.music_env import *
@@ -8,36 +8,6 @@ from src.recommenders import *
 from src.plots import *
 
 
-def compute_counts_and_means(env, chosen_arms, rewards):
-    """
-    A partir do histórico (chosen_arms, rewards),
-    calcula, para cada gênero:
-
-    - quantas vezes foi escolhido
-    - quantos likes recebeu
-    - média de likes (estimativa da probabilidade)
-    """
-    n_arms = env.n_arms
-    chosen_arms = np.array(chosen_arms, dtype=int)
-    rewards = np.array(rewards, dtype=float)
-
-    counts = np.zeros(n_arms, dtype=int)
-    likes = np.zeros(n_arms, dtype=float)
-    means = np.zeros(n_arms, dtype=float)
-
-    for arm in range(n_arms):
-        mask = (chosen_arms == arm)
-        counts[arm] = mask.sum()
-        if counts[arm] > 0:
-            likes[arm] = rewards[mask].sum()
-            means[arm] = likes[arm] / counts[arm]
-        else:
-            likes[arm] = 0
-            means[arm] = 0.0
-
-    return counts, likes, means
-
-
 # ====================================================
 #   CONFIGURAÇÃO GERAL DO APP
 # ====================================================
@@ -50,6 +20,75 @@ st.set_page_config(
 #   PÁGINA 1 - MODO SIMULADO
 # ====================================================
 
+@st.cache_resource
+def obter_cache_simulacao():
+    # Um único cache compartilhado por todas as sessões (a turma inteira).
+    # Defina BANDITS_CACHE_DIR para guardar também em disco.
+    return SimulationCache(max_entries=64, directory=os.environ.get("BANDITS_CACHE_DIR"))
+
+
+# Algoritmos do modo simulado (nome -> construtor), na ordem dos gráficos.
+# Os nomes entram na chave do cache: resultados gravados com outro conjunto
+# de algoritmos não são reaproveitados.
+ALGORITMOS_SIMULADOS = {
+    "Aleatório": lambda n_arms, epsilon, rng: RandomRecommender(n_arms, rng=rng),
+    "Epsilon-Greedy": lambda n_arms, epsilon, rng: EpsilonGreedyRecommender(n_arms, epsilon=epsilon, rng=rng),
+    "UCB1": lambda n_arms, epsilon, rng: UCBRecommender(n_arms, rng=rng),
+    "Thompson Sampling": lambda n_arms, epsilon, rng: ThompsonSamplingRecommender(n_arms, rng=rng),
+}
+
+
+def rodar_simulacoes(genres, true_probs, n_rounds, epsilon, seed, perfis=None):
+    # Rodar todos os algoritmos com a mesma semente/base. Os likes de
+    # todas as rodadas são sorteados uma vez (números aleatórios comuns):
+    # cada algoritmo recebe uma cópia do ambiente que lê a mesma tabela,
+    # então todos enfrentam exatamente a mesma "turma".
+    # perfis: dicionário opcional que recebe um PhaseTimer por algoritmo.
+    def timer(nome):
+        if perfis is None:
+            return None
+        perfis[nome] = PhaseTimer()
+        return perfis[nome]
+
+    resultados = {}
+    env_seed, policy_seed = np.random.SeedSequence(seed).spawn(2)
+    base_env = CommonRandomEnvironment(genres, true_probs, n_rounds, rng=env_seed)
+
+    for nome, criar in ALGORITMOS_SIMULADOS.items():
+        env = base_env.fork()
+        policy = criar(env.n_arms, epsilon, policy_seed)
+        resultados[nome] = simulate(env, policy, n_rounds=n_rounds, instrument=timer(nome))
+
+    return resultados
+
+
+def montar_figuras(genres, resultados):
+    figuras = {
+        "recompensa": fig_cumulative_reward_all(
+            resultados, titulo="Recompensa acumulada – modo simulado"
+        ),
+        "pct_otimo": fig_pct_optimal_all(
+            resultados, titulo="% de escolhas do melhor gênero – modo simulado"
+        ),
+        "uso": {},
+        "medias": {},
+    }
+    for nome, res in resultados.items():
+        figuras["uso"][nome] = fig_genre_usage(
+            genres,
+            res["chosen_arms"],
+            titulo=f"Uso de cada gênero – {nome}",
+        )
+        figuras["medias"][nome] = fig_mean_estimates(
+            genres,
+            res["chosen_arms"],
+            res["rewards"],
+            titulo=f"Média de likes estimada – {nome}",
+        )
+    return figuras
+
+
+
 def pagina_modo_simulado():
     st.title("🎧 Modo 1 – Simulado (Gêneros Musicais)")
     st.write(
@@ -57,7 +96,7 @@ def pagina_modo_simulado():
         Neste modo, o comportamento da turma é **simulado**: 
         cada gênero musical tem uma probabilidade 'verdadeira' de like.
         
-        Os algoritmos (Aleatório, Epsilon-Greedy, UCB1) tentam aprender
+        Os algoritmos (Aleatório, Epsilon-Greedy, UCB1, Thompson Sampling) tentam aprender
         qual gênero funciona melhor ao longo das rodadas.
         """
     )
@@ -114,51 +153,53 @@ def pagina_modo_simulado():
 
     st.sidebar.markdown("---")
     seed = st.sidebar.number_input("Semente aleatória (para reprodutibilidade)", 0, 10_000, 42)
+    mostrar_perfil = st.sidebar.checkbox("Mostrar tempo por fase (perfil)", value=False)
 
     # ---------- Botão de simulação ----------
+    cache = obter_cache_simulacao()
     if st.button("▶ Rodar simulação"):
-        # Rodar os três algoritmos com a mesma semente/base
-        resultados = {}
-
-        # Aleatório
-        np.random.seed(seed)
-        rand_env = MusicEnvironment(default_genres, true_probs)
-        rand_policy = RandomRecommender(rand_env.n_arms)
-        resultados["Aleatório"] = simulate(rand_env, rand_policy, n_rounds=n_rounds)
-
-        # Epsilon-Greedy
-        np.random.seed(seed)
-        eps_env = MusicEnvironment(default_genres, true_probs)
-        eps_policy = EpsilonGreedyRecommender(eps_env.n_arms, epsilon=epsilon)
-        resultados[f"Epsilon-Greedy"] = simulate(
-            eps_env, eps_policy, n_rounds=n_rounds
-        )
-
-        # UCB1
-        np.random.seed(seed)
-        ucb_env = MusicEnvironment(default_genres, true_probs)
-        ucb_policy = UCBRecommender(ucb_env.n_arms)
-        resultados[f"UCB1"] = simulate(
-            ucb_env, ucb_policy, n_rounds=n_rounds
+        # Parâmetros iguais -> resultados e figuras já prontos no cache
+        chave = make_key(
+            genres=default_genres, probs=true_probs,
+            n_rounds=n_rounds, epsilon=epsilon, seed=seed,
+            algoritmos=list(ALGORITMOS_SIMULADOS),
         )
+        entrada = cache.get(chave)
+        if entrada is None:
+            # O tempo por fase só é medido quando a simulação roda de fato
+            perfis = {} if mostrar_perfil else None
+            resultados = rodar_simulacoes(default_genres, true_probs, n_rounds, epsilon, seed, perfis)
+            figuras = montar_figuras(default_genres, resultados)
+            cache.put(chave, resultados, extras={"figuras": figuras, "perfis": perfis})
+        else:
+            resultados = entrada["resultados"]
+            figuras = entrada["extras"].get("figuras") or montar_figuras(default_genres, resultados)
+            perfis = entrada["extras"].get("perfis")
+
+        if mostrar_perfil:
+            st.subheader("Tempo por fase da simulação")
+            if perfis:
+                st.table([
+                    {"algoritmo": nome, **linha}
+                    for nome, timer in perfis.items()
+                    for linha in timer.summary()
+                ])
+            else:
+                st.caption(
+                    "Resultado vindo do cache: o tempo por fase só é medido quando a "
+                    "simulação roda. Mude algum parâmetro (ex.: a semente) para medir."
+                )
 
         st.markdown("---")
         st.subheader("Curvas de aprendizado - Comparação de Algoritmos")
 
-        fig1 = fig_cumulative_reward_all(
-            resultados, titulo="Recompensa acumulada – modo simulado"
-        )
-        fig2 = fig_pct_optimal_all(
-            resultados, titulo="% de escolhas do melhor gênero – modo simulado"
-        )
-
         col_l1, col_l2 = st.columns(2)
         with col_l1:
             # st.pyplot(fig1)
-            st.plotly_chart(fig1, use_container_width=True)
+            st.plotly_chart(figuras["recompensa"], use_container_width=True)
         with col_l2:
             # st.pyplot(fig2)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(figuras["pct_otimo"], use_container_width=True)
 
         st.info(
             "Nota: No começo a uma exploração melhor, por isso"
@@ -166,82 +207,16 @@ def pagina_modo_simulado():
             "\nConforme o algortimo aprende, começa a recomendar o genêro de maior probabiliade / nota."
         )
 
-        # Detalhamento Aleatório
         st.markdown("---")
-        st.subheader("Detalhando o comportamento do Aleatório")
-        ucb_results = resultados[f"Aleatório"]
-
-        fig3 = fig_genre_usage(
-            ucb_env.genres,
-            ucb_results["chosen_arms"],
-            titulo="Uso de cada gênero – Aleatório",
-        )
-        fig4 = fig_mean_estimates(
-            ucb_env.genres,
-            ucb_results["chosen_arms"],
-            ucb_results["rewards"],
-            titulo="Média de likes estimada – Aleatório",
-        )
-
-        # Plots de BARRAS lado a lado
-        col_b1, col_b2 = st.columns(2)
-        with col_b1:
-            # st.pyplot(fig3)
-            st.plotly_chart(fig3, use_container_width=True)
-        with col_b2:
-            # st.pyplot(fig4)
-            st.plotly_chart(fig4, use_container_width=True)
-
-        # Detalhamento UCB
-        st.subheader("Detalhando o comportamento do UCB1")
-        ucb_results = resultados[f"UCB1"]
-
-        fig3 = fig_genre_usage(
-            ucb_env.genres,
-            ucb_results["chosen_arms"],
-            titulo="Uso de cada gênero – UCB1",
-        )
-        fig4 = fig_mean_estimates(
-            ucb_env.genres,
-            ucb_results["chosen_arms"],
-            ucb_results["rewards"],
-            titulo="Média de likes estimada – UCB1",
-        )
-
-        # Plots de BARRAS lado a lado
-        col_b3, col_b4 = st.columns(2)
-        with col_b3:
-            # st.pyplot(fig3)
-            st.plotly_chart(fig3, use_container_width=True)
-        with col_b4:
-            # st.pyplot(fig4)
-            st.plotly_chart(fig4, use_container_width=True)
-
-        # Epsilon Greedy
-        st.subheader("Detalhando o comportamento do Epsilon-Greedy")
-        ucb_results = resultados[f"Epsilon-Greedy"]
-
-        fig3 = fig_genre_usage(
-            ucb_env.genres,
-            ucb_results["chosen_arms"],
-            titulo="Uso de cada gênero – Epsilon-Greedy",
-        )
-        fig4 = fig_mean_estimates(
-            ucb_env.genres,
-            ucb_results["chosen_arms"],
-            ucb_results["rewards"],
-            titulo="Média de likes estimada – Epsilon-Greedy",
-        )
-
-        # Plots de BARRAS lado a lado
-        col_b5, col_b6 = st.columns(2)
-        with col_b5:
-            # st.pyplot(fig3)
-            st.plotly_chart(fig3, use_container_width=True)
-        with col_b6:
-            # st.pyplot(fig4)
-            st.plotly_chart(fig4, use_container_width=True)
+        for nome in resultados.keys():
+            st.subheader(f"Detalhando o comportamento do {nome}")
 
+            # Plots de BARRAS lado a lado
+            col_b1, col_b2 = st.columns(2)
+            with col_b1:
+                st.plotly_chart(figuras["uso"][nome], use_container_width=True)
+            with col_b2:
+                st.plotly_chart(figuras["medias"][nome], use_container_width=True)
 
         st.info(
             "Algortimos não aleatórios tendem a recomendar mais frequentemente os"
@@ -250,6 +225,12 @@ def pagina_modo_simulado():
     else:
         st.warning("Clique em **Rodar simulação** para ver as curvas.")
 
+    estatisticas = cache.stats()
+    st.sidebar.caption(
+        f"Cache de simulações: {estatisticas['hits'] + estatisticas['disk_hits']} acertos, "
+        f"{estatisticas['misses']} falhas, {estatisticas['entries']} entradas"
+    )
+
     st.markdown("---")
     st.markdown("---")
 
@@ -270,16 +251,41 @@ def inicializar_estado_ao_vivo():
         ]
         st.session_state.policy = RandomRecommender(len(st.session_state.genres))
         st.session_state.policy_label = "Aleatório"
-        st.session_state.chosen_arms = []
-        st.session_state.rewards = []
+        zerar_historico_ao_vivo()
         st.session_state.waiting_feedback = False
         st.session_state.current_arm = None
         st.session_state.current_song_title = None 
 
 
+def zerar_historico_ao_vivo():
+    n_arms = len(st.session_state.genres)
+    st.session_state.history = History(n_arms, chunk_size=1024)
+    # Estatísticas por gênero, atualizadas a cada feedback (O(1))
+    st.session_state.counts = np.zeros(n_arms, dtype=int)
+    st.session_state.likes = np.zeros(n_arms)
+
+
+def estatisticas_ao_vivo():
+    # Tentativas, likes e média por gênero em O(K), sem varrer o histórico.
+    # Se os contadores faltarem ou não baterem com o histórico (ex.: um
+    # rerun do Streamlit interrompeu processar_feedback entre as duas
+    # atualizações), são reconstruídos do histórico em O(N + K).
+    history = st.session_state.history
+    counts = st.session_state.get("counts")
+    if counts is None or len(counts) != len(st.session_state.genres) or counts.sum() != len(history):
+        counts, likes, _ = compute_counts_and_means(
+            len(st.session_state.genres), history.chosen_arms, history.rewards
+        )
+        st.session_state.counts = counts
+        st.session_state.likes = likes
+
+    likes = st.session_state.likes
+    means = np.divide(likes, counts, out=np.zeros(len(counts)), where=counts > 0)
+    return counts, likes, means
+
+
 def resetar_experimento_ao_vivo(alg_choice, epsilon):
-    st.session_state.chosen_arms = []
-    st.session_state.rewards = []
+    zerar_historico_ao_vivo()
     st.session_state.waiting_feedback = False
     st.session_state.current_arm = None
     st.session_state.current_song_title = None
@@ -290,6 +296,9 @@ def resetar_experimento_ao_vivo(alg_choice, epsilon):
     elif alg_choice == "Epsilon-Greedy":
         st.session_state.policy = EpsilonGreedyRecommender(len(st.session_state.genres), epsilon=epsilon)
         st.session_state.policy_label = f"Epsilon-Greedy"
+    elif alg_choice == "Thompson Sampling":
+        st.session_state.policy = ThompsonSamplingRecommender(len(st.session_state.genres))
+        st.session_state.policy_label = "Thompson Sampling"
     else:
         st.session_state.policy = UCBRecommender(len(st.session_state.genres))
         st.session_state.policy_label = f"UCB"
@@ -299,8 +308,10 @@ def processar_feedback(reward):
     # atualiza com o feedback da recomendação atual
     arm = st.session_state.current_arm
     st.session_state.policy.update(arm, reward)
-    st.session_state.chosen_arms.append(arm)
-    st.session_state.rewards.append(reward)
+    counts, likes, _ = estatisticas_ao_vivo()
+    counts[arm] += 1
+    likes[arm] += reward
+    st.session_state.history.append(arm, reward)
 
     # Prepara a PRÓXIMA recomendação automaticamente
     next_arm = st.session_state.policy.select_arm()
@@ -375,118 +386,14 @@ def processar_feedback(reward):
 #     else:  # "noite_de_sub"
 #         return f"Noite de {sub}"
     
-def gerar_nome_musica(genero: str) -> str:
-    genero = genero.lower()
-
-    # Bancos maiores de palavras por gênero (não precisa ser realista, só divertido)
-    palavras = {
-        "pop": {
-            "adjs": ["Perfeito", "Impossível", "Secreto", "Inesquecível", "Eterno", "Doce",
-                     "Louco", "Brilhante", "Proibido", "Azul", "Dançante", "Veloz", "Sincero"],
-            "subs": ["Amor", "Verão", "Destino", "Coração", "Momento", "Beijo", "Noite",
-                     "Segredo", "Mensagem", "Memória", "Sonho", "Festa", "Estrela"],
-            "verbs": ["Diz", "Sente", "Chama", "Vem", "Foge", "Volta", "Explode", "Brilha"],
-            "lugares": ["Praia", "Cidade", "Pista", "Varanda", "Céu", "Elevador", "Quarto"],
-        },
-        "rock": {
-            "adjs": ["Quebrado", "Selvagem", "Elétrico", "Sombrio", "Rebelde", "Áspero",
-                     "Cruel", "Vermelho", "Infernal", "Livre", "Gigante", "Maldito"],
-            "subs": ["Silêncio", "Tempestade", "Grito", "Caos", "Estrada", "Motor", "Fumaça",
-                     "Cicatriz", "Ruína", "Noite", "Pedra", "Ferro", "Sombra"],
-            "verbs": ["Rasga", "Queima", "Late", "Cai", "Sobe", "Quebra", "Urra", "Ressoa"],
-            "lugares": ["Garagem", "Asfalto", "Deserto", "Beco", "Palco", "Subsolo"],
-        },
-        "funk": {
-            "adjs": ["Proibido", "Pesado", "Diferente", "Do Bailão", "Da Quebrada", "Malvadão",
-                     "Nervoso", "Reluzente", "Estourado", "Safado", "Gelado"],
-            "subs": ["Beat", "Bailão", "Tamborzão", "Rolê", "Mandela", "Passinho", "Revoada",
-                     "Grave", "Chão", "Fluxo", "Favela", "Vibe"],
-            "verbs": ["Desce", "Sobe", "Joga", "Bate", "Rebola", "Encosta", "Gira", "Treme"],
-            "lugares": ["Quadra", "Beco", "Baile", "Rua", "Morro", "Piscina", "Pista"],
-        },
-        "sertanejo": {
-            "adjs": ["Velho", "Doído", "Apaixonado", "Solteiro", "Sozinho", "Perdido",
-                     "Tristonho", "Bêbado", "Calado", "Valente", "Teimoso"],
-            "subs": ["Coração", "Buteco", "Interior", "Pé de Serra", "Saudade", "Estrada",
-                     "Paixão", "Chapéu", "Chuva", "Aliança", "Mensagem", "Lembrança"],
-            "verbs": ["Chora", "Liga", "Some", "Volta", "Apaixona", "Esquece", "Promete"],
-            "lugares": ["Buteco", "Rodeio", "Fazenda", "Cidadezinha", "Estrada de Terra"],
-        },
-        "mpb": {
-            "adjs": ["Doce", "Calmo", "Profundo", "Suave", "Antigo", "Sereno",
-                     "Lírico", "Morno", "Cintilante", "Tranquilo", "Vago"],
-            "subs": ["Mar", "Lua", "Café", "Saudade", "Janela", "Brisa", "Rua",
-                     "Outono", "Poesia", "Chuva", "Silêncio", "Sorriso"],
-            "verbs": ["Lembra", "Canta", "Sopra", "Flutua", "Encosta", "Abraça"],
-            "lugares": ["Varanda", "Calçada", "Praça", "Rio", "Esquina", "Barzinho"],
-        },
-        "forró": {
-            "adjs": ["Quente", "Apaixonado", "Arretado", "Do Sertão", "Do Nordeste", "Faceiro",
-                     "Safadinho", "Bonito", "Vaqueiro", "Matuto"],
-            "subs": ["Forró", "Xote", "Arrasta-pé", "São João", "Lua de Mel", "Sanfona",
-                     "Fogueira", "Chão", "Pisada", "Cangaço", "Baião"],
-            "verbs": ["Arreda", "Chega", "Chama", "Dança", "Vira", "Puxa", "Roda"],
-            "lugares": ["Arraiá", "Sertão", "Feira", "Riacho", "Vila", "Fogueira"],
-        },
-        "default": {
-            "adjs": ["Novo", "Antigo", "Secreto", "Distante", "Perdido", "Lindo",
-                     "Estranho", "Curioso", "Alto", "Baixo"],
-            "subs": ["Caminho", "Sonho", "Horizonte", "Encontro", "Sinal", "Vento",
-                     "Noite", "Luz", "Tempo"],
-            "verbs": ["Corre", "Chama", "Sobe", "Cai", "Vira", "Some"],
-            "lugares": ["Lugar Nenhum", "Qualquer Canto", "Outro Lado", "Aqui"],
-        },
-    }
+@st.cache_resource
+def obter_catalogo():
+    # Tabelas de palavras montadas uma vez e compartilhadas entre sessões
+    return SongCatalog()
 
-    # escolhe o banco certo
-    if "pop" in genero:
-        base = palavras["pop"]
-    elif "rock" in genero:
-        base = palavras["rock"]
-    elif "funk" in genero:
-        base = palavras["funk"]
-    elif "sertanejo" in genero:
-        base = palavras["sertanejo"]
-    elif "mpb" in genero:
-        base = palavras["mpb"]
-    elif "forró" in genero or "forro" in genero:
-        base = palavras["forró"]
-    else:
-        base = palavras["default"]
-
-    adj = random.choice(base["adjs"])
-    sub1 = random.choice(base["subs"])
-    sub2 = random.choice(base["subs"])
-    verb = random.choice(base["verbs"])
-    lugar = random.choice(base["lugares"])
-
-    conectores = ["e", "com", "sem", "contra", "por", "pra", "depois de", "antes de"]
-    conn = random.choice(conectores)
-
-    # vários padrões de título
-    padroes = [
-        lambda: f"{adj} {sub1}",
-        lambda: f"{sub1} {conn} {sub2}",
-        lambda: f"{verb} {sub1}",
-        lambda: f"{sub1} de {lugar}",
-        lambda: f"{adj} {sub1} de {lugar}",
-        lambda: f"{sub1} na {lugar}",
-        lambda: f"{verb} na {lugar}",
-        lambda: f"{sub1}: {adj} {sub2}",
-        lambda: f"{sub1} ({adj})",
-        lambda: f"{adj} {sub1} / {sub2}",
-        lambda: f"{sub1} do {adj}",
-        lambda: f"{verb} {conn} {sub1}",
-    ]
-
-    titulo = random.choice(padroes)()
-
-    # chance pequena de colocar numeral romano no fim (até III)
-    romanos = [" I", " II", " III"]
-    if random.random() < 0.18:  # ~18% de chance
-        titulo += random.choice(romanos)
 
-    return titulo
+def gerar_nome_musica(genero: str) -> str:
+    return obter_catalogo().title(genero)
 
 
 def pagina_modo_ao_vivo():
@@ -507,7 +414,7 @@ def pagina_modo_ao_vivo():
 
     alg_choice = st.sidebar.radio(
         "Algoritmo",
-        ["Aleatório", "Epsilon-Greedy", "UCB1"],
+        ["Aleatório", "Epsilon-Greedy", "UCB1", "Thompson Sampling"],
     )
 
     epsilon_live = 0.1
@@ -569,20 +476,14 @@ def pagina_modo_ao_vivo():
                 args=(0,)
             )
     
-    music_env = MusicEnvironment(["Pop", "Rock", "Funk", "Sertanejo", "MPB","Forró"])
     # Mostrar resumo e gráficos
-    if len(st.session_state.chosen_arms) > 0:
+    if len(st.session_state.history) > 0:
         st.subheader("Resumo até agora")
 
-        n_arms = len(st.session_state.genres)
-        counts, likes, means = compute_counts_and_means(
-            music_env,
-            st.session_state.chosen_arms,
-            st.session_state.rewards,
-        )
+        counts, likes, means = estatisticas_ao_vivo()
 
-        total_rodadas = len(st.session_state.chosen_arms)
-        total_likes = int(sum(st.session_state.rewards))
+        total_rodadas = int(counts.sum())
+        total_likes = int(likes.sum())
 
         st.write(f"- **Rodadas:** {total_rodadas}")
         st.write(f"- **Likes totais:** {total_likes}")
@@ -606,8 +507,8 @@ def pagina_modo_ao_vivo():
         with col1:
             fig_usage = fig_genre_usage(
                 st.session_state.genres,
-                st.session_state.chosen_arms,
                 titulo="Nº de recomendações por gênero",
+                counts=counts,
             )
             # st.pyplot(fig_usage)
             st.plotly_chart(fig_usage, use_container_width=True)
@@ -615,9 +516,8 @@ def pagina_modo_ao_vivo():
         with col2:
             fig_means = fig_mean_estimates(
                 st.session_state.genres,
-                st.session_state.chosen_arms,
-                st.session_state.rewards,
                 titulo="Média de likes estimada",
+                means=means,
             )
             # st.pyplot(fig_means)
             st.plotly_chart(fig_means, use_container_width=True)
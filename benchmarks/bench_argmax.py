@@ -0,0 +1,57 @@
+"""
+Benchmark: explotação do Epsilon-Greedy com argmax denso vs. árvore de
+torneio (indexed=True), para catálogos de tamanho crescente.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_argmax
+"""
+import time
+
+import numpy as np
+
+from src.recommenders import EpsilonGreedyRecommender
+
+
+def time_per_round(policy, n_rounds, rewards):
+    # Só explotação (epsilon=0): select_arm + update por rodada
+    start = time.perf_counter()
+    for t in range(n_rounds):
+        arm = policy.select_arm()
+        policy.update(arm, rewards[t])
+    return (time.perf_counter() - start) / n_rounds
+
+
+def main(sizes=(8, 32, 128, 512, 2_048, 8_192, 32_768, 131_072, 524_288), n_rounds=2_000):
+    rng = np.random.default_rng(0)
+    rewards = (rng.random(n_rounds) < 0.5).astype(float)
+
+    # Aquecimento: sem ele, o primeiro K medido (modo denso) paga o custo
+    # de primeira execução e parece mais lento do que é
+    for indexed in (False, True):
+        time_per_round(EpsilonGreedyRecommender(sizes[0], epsilon=0.0, indexed=indexed),
+                       n_rounds, rewards)
+
+    print(f"{'K':>8} {'denso (us)':>12} {'indexado (us)':>14}")
+    crossover = None
+    for n_arms in sizes:
+        results = []
+        for indexed in (False, True):
+            policy = EpsilonGreedyRecommender(n_arms, epsilon=0.0, indexed=indexed)
+            results.append(time_per_round(policy, n_rounds, rewards) * 1e6)
+        dense, indexed = results
+        print(f"{n_arms:>8} {dense:>12.2f} {indexed:>14.2f}")
+        # Menor K a partir do qual o indexado fica sempre mais rápido
+        # (última troca de sinal, não a primeira vitória)
+        if indexed >= dense:
+            crossover = None
+        elif crossover is None:
+            crossover = n_arms
+
+    if crossover is None:
+        print("O modo indexado não ficou à frente do denso no maior tamanho testado.")
+    else:
+        print(f"O modo indexado passa a compensar a partir de K ≈ {crossover}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: tempo de import do núcleo da simulação (src.recommenders,
+src.music_env, src.utils) num processo novo, comparado ao import do NumPy
+sozinho. Falha se o núcleo carregar Plotly/Matplotlib/Streamlit (ou
+asyncio/concurrent.futures, que só são importados quando usados) ou se o
+custo além do NumPy passar da meta.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_import
+"""
+import os
+import subprocess
+import sys
+import time
+
+# Meta: o núcleo deve custar no máximo isto além do próprio NumPy
+TARGET_SECONDS = 0.05
+HEAVY_MODULES = ("plotly", "matplotlib", "streamlit", "asyncio", "concurrent.futures")
+
+CORE_IMPORT = "import src.recommenders, src.music_env, src.utils"
+CHECK_HEAVY = (
+    "import sys; heavy = [m for m in {mods!r} if m in sys.modules]; "
+    "sys.exit(','.join(heavy) if heavy else 0)"
+)
+
+
+def best_time(code, repeat=15):
+    # Menor tempo de processo novo (descarta ruído do sistema)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    baseline = best_time("import numpy, numpy.random")
+    core = best_time(CORE_IMPORT)
+    overhead = core - baseline
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    check = subprocess.run(
+        [sys.executable, "-c", CORE_IMPORT + "; " + CHECK_HEAVY.format(mods=HEAVY_MODULES)],
+        cwd=root, capture_output=True, text=True,
+    )
+
+    print(f"numpy (+random):{baseline * 1e3:7.1f} ms")
+    print(f"núcleo:        {core * 1e3:7.1f} ms")
+    print(f"além do NumPy: {overhead * 1e3:7.1f} ms (meta: {TARGET_SECONDS * 1e3:.0f} ms)")
+
+    ok = True
+    if check.returncode != 0:
+        print(f"FALHOU: o núcleo importou módulos que deveriam ser adiados: {check.stderr.strip()}")
+        ok = False
+    if overhead > TARGET_SECONDS:
+        print("FALHOU: import do núcleo acima da meta.")
+        ok = False
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
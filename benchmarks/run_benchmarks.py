@@ -0,0 +1,251 @@
+"""
+Suíte de benchmarks dos caminhos críticos dos bandits.
+
+Mede operações por segundo e pico de memória (tracemalloc) de:
+- select_arm/update de cada recomendador, para K em {8, 10³, 10⁵};
+- MusicEnvironment.pull e pull_batch;
+- simulate em vários horizontes;
+- compute_counts_and_means;
+- construção das figuras de src.plots.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json   # diff com a base
+    python -m benchmarks.run_benchmarks --quick --filter ucb
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.music_env import MusicEnvironment
+from src.recommenders import (
+    EpsilonGreedyRecommender, RandomRecommender, ThompsonSamplingRecommender, UCBRecommender,
+)
+from src.utils import compute_counts_and_means, simulate
+
+
+ARM_COUNTS = (8, 1_000, 100_000)
+HORIZONS = (1_000, 10_000, 100_000)
+
+# Diferença (relativa) de ops/s a partir da qual o --compare acusa regressão
+REGRESSION_THRESHOLD = 0.2
+
+
+def _warm_policy(policy, n_arms, rng):
+    # Estado "no meio de uma execução": todos os braços já testados
+    arms = np.arange(n_arms)
+    policy.update_batch(arms, (rng.random(n_arms) < 0.5).astype(float))
+    return policy
+
+
+def _policy_cases():
+    factories = {
+        "random": lambda k: RandomRecommender(k, rng=0),
+        "epsilon_greedy": lambda k: EpsilonGreedyRecommender(k, epsilon=0.1, rng=0),
+        "epsilon_greedy_indexed": lambda k: EpsilonGreedyRecommender(k, epsilon=0.1, indexed=True, rng=0),
+        "ucb": lambda k: UCBRecommender(k, rng=0),
+        "ucb_indexed": lambda k: UCBRecommender(k, indexed=True, rng=0),
+        "thompson": lambda k: ThompsonSamplingRecommender(k, rng=0),
+    }
+    for name, factory in factories.items():
+        for n_arms in ARM_COUNTS:
+            def setup(factory=factory, n_arms=n_arms):
+                rng = np.random.default_rng(1)
+                policy = _warm_policy(factory(n_arms), n_arms, rng)
+                rewards = (rng.random(1_000) < 0.5).astype(float)
+
+                def run():
+                    for reward in rewards:
+                        policy.update(policy.select_arm(), reward)
+                    return len(rewards)
+                return run
+            yield f"policy.{name}.select_update.K{n_arms}", setup
+
+
+def _env_cases():
+    def setup_pull():
+        env = MusicEnvironment(range(8), np.linspace(0.1, 0.9, 8), rng=0)
+        arms = np.random.default_rng(1).integers(0, 8, 10_000).tolist()
+
+        def run():
+            for arm in arms:
+                env.pull(arm)
+            return len(arms)
+        return run
+
+    def setup_pull_batch():
+        env = MusicEnvironment(range(8), np.linspace(0.1, 0.9, 8), rng=0)
+        arms = np.random.default_rng(1).integers(0, 8, 100_000)
+
+        def run():
+            env.pull_batch(arms)
+            return len(arms)
+        return run
+
+    yield "env.pull", setup_pull
+    yield "env.pull_batch", setup_pull_batch
+
+
+def _simulate_cases():
+    for n_rounds in HORIZONS:
+        def setup(n_rounds=n_rounds):
+            def run():
+                env = MusicEnvironment(range(8), np.linspace(0.1, 0.9, 8), rng=0)
+                simulate(env, UCBRecommender(8, rng=0), n_rounds=n_rounds)
+                return n_rounds
+            return run
+        yield f"simulate.ucb.T{n_rounds}", setup
+
+
+def _stats_cases():
+    def setup():
+        rng = np.random.default_rng(0)
+        arms = rng.integers(0, 8, 1_000_000)
+        rewards = (rng.random(1_000_000) < 0.5).astype(float)
+
+        def run():
+            compute_counts_and_means(8, arms, rewards)
+            return len(arms)
+        return run
+
+    yield "compute_counts_and_means.N1000000", setup
+
+
+def _plot_cases():
+    def setup_curves():
+        from src.plots import fig_cumulative_reward_all, fig_pct_optimal_all
+
+        env = MusicEnvironment(range(8), np.linspace(0.1, 0.9, 8), rng=0)
+        resultados = {"ucb": simulate(env, UCBRecommender(8, rng=0), n_rounds=100_000)}
+
+        def run():
+            fig_cumulative_reward_all(resultados)
+            fig_pct_optimal_all(resultados)
+            return 2
+        return run
+
+    def setup_bars():
+        from src.plots import fig_genre_usage, fig_mean_estimates
+
+        rng = np.random.default_rng(0)
+        genres = [f"g{i}" for i in range(8)]
+        arms = rng.integers(0, 8, 100_000)
+        rewards = (rng.random(100_000) < 0.5).astype(float)
+
+        def run():
+            fig_genre_usage(genres, arms)
+            fig_mean_estimates(genres, arms, rewards)
+            return 2
+        return run
+
+    yield "plots.learning_curves.T100000", setup_curves
+    yield "plots.bar_charts.N100000", setup_bars
+
+
+def all_cases():
+    yield from _policy_cases()
+    yield from _env_cases()
+    yield from _simulate_cases()
+    yield from _stats_cases()
+    yield from _plot_cases()
+
+
+def measure(setup, min_time):
+    """
+    Roda o caso até somar min_time segundos e retorna ops/s; depois roda
+    uma vez com tracemalloc para medir o pico de memória.
+    """
+    run = setup()
+    run()  # aquecimento
+
+    ops, elapsed = 0, 0.0
+    while elapsed < min_time:
+        start = time.perf_counter()
+        ops += run()
+        elapsed += time.perf_counter() - start
+
+    run = setup()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops_per_sec": ops / elapsed, "peak_bytes": peak}
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Imprime a variação de cada caso em relação à base e retorna os nomes
+    dos casos que ficaram mais lentos que REGRESSION_THRESHOLD.
+    """
+    regressions = []
+    print(f"\n{'caso':<48} {'base ops/s':>12} {'atual ops/s':>12} {'variação':>9}")
+    for name, res in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>12} {res['ops_per_sec']:>12.0f} {'novo':>9}")
+            continue
+        change = res["ops_per_sec"] / base["ops_per_sec"] - 1
+        flag = ""
+        if change < -REGRESSION_THRESHOLD:
+            flag = "  <-- regressão"
+            regressions.append(name)
+        print(f"{name:<48} {base['ops_per_sec']:>12.0f} {res['ops_per_sec']:>12.0f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="arquivo JSON para gravar os resultados")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--filter", default="", help="roda só os casos cujo nome contém este texto")
+    parser.add_argument("--quick", action="store_true", help="menos repetições (resultado mais ruidoso)")
+    args = parser.parse_args(argv)
+
+    min_time = 0.05 if args.quick else 0.5
+    results = {}
+    for name, setup in all_cases():
+        if args.filter not in name:
+            continue
+        results[name] = measure(setup, min_time)
+        res = results[name]
+        print(f"{name:<48} {res['ops_per_sec']:>14,.0f} ops/s {res['peak_bytes'] / 2**20:>9.2f} MiB")
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
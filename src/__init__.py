@@ -1,4 +1,6 @@
 from .music_env import music_env
 from .recommenders import random_rec, ucb, epsilon_greedy
 from .utils import utils
-from .plots import plots
\ No newline at end of file
+
+# src.plots (Plotly) não é importado aqui: o núcleo da simulação carrega só
+# com NumPy, e as figuras são carregadas no primeiro uso.
@@ -0,0 +1,176 @@
+"""
+Linha de comando para simulações longas, sem Streamlit.
+
+Exemplos (a partir da raiz do repositório):
+    python -m src.cli --genres Pop Rock Funk --probs 0.3 0.4 0.85 \\
+        --policies ucb epsilon_greedy --rounds 10000000 --replicas 8 \\
+        --output resultados/
+    python -m src.cli --config experimento.json --workers 4
+
+O arquivo de configuração é um JSON com as mesmas opções (genres, probs,
+policies, epsilon, rounds, replicas, workers, seed, chunk_size, output);
+opções passadas na linha de comando têm prioridade sobre ele.
+
+Cada réplica é gravada num ResultStore em 'output' (uma execução por
+política x réplica) e o resumo por política vai para output/summary.json.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from .music_env import MusicEnvironment
+from .utils.store import ResultStore
+from .utils.sweep import POLICIES, aggregate_sweep, make_policy
+from .utils.utils import simulate_stream
+
+
+DEFAULTS = {
+    "genres": None,
+    "probs": None,
+    "policies": ["random", "epsilon_greedy", "ucb"],
+    "epsilon": 0.1,
+    "rounds": 10_000,
+    "replicas": 1,
+    "workers": None,
+    "seed": 0,
+    "chunk_size": 65_536,
+    "output": "resultados",
+}
+
+
+def _compact_chunks(chunks, n_arms, summary):
+    """
+    Converte os blocos de simulate_stream para tipos menores antes de ir
+    ao disco (likes em uint8, gêneros em int16/int32, likes acumulados em
+    int64) e guarda em 'summary' os valores finais da execução.
+    """
+    arm_dtype = np.int16 if n_arms <= np.iinfo(np.int16).max else np.int32
+    for chunk in chunks:
+        summary["final_reward"] = float(chunk["cumulative_reward"][-1])
+        summary["final_pct_optimal"] = float(chunk["pct_optimal"][-1])
+        yield {
+            "start": chunk["start"],
+            "rewards": chunk["rewards"].astype(np.uint8),
+            "chosen_arms": chunk["chosen_arms"].astype(arm_dtype),
+            "cumulative_reward": chunk["cumulative_reward"].astype(np.int64),
+            "pct_optimal": chunk["pct_optimal"],
+        }
+
+
+def _json_safe(value):
+    # NaN/inf não existem em JSON: viram null (ex.: o intervalo de
+    # confiança de aggregate_sweep com uma réplica só)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def _run_replica(output, genres, probs, policy, epsilon, n_rounds, chunk_size,
+                 replica, seed, seed_seq):
+    # Executado nos processos filhos: precisa ser uma função de módulo
+    env_seed, policy_seed = seed_seq.spawn(2)
+    env = MusicEnvironment(genres, probs, rng=env_seed)
+    algorithm = make_policy(policy, env.n_arms, epsilon=epsilon, rng=policy_seed)
+
+    summary = {"policy": policy, "epsilon": epsilon if policy == "epsilon_greedy" else None,
+               "n_rounds": n_rounds, "seed_index": replica}
+    chunks = simulate_stream(env, algorithm, n_rounds=n_rounds, chunk_size=chunk_size)
+    config = {"genres": genres, "probs": probs, "seed": seed, **summary}
+    summary["run_id"] = ResultStore(output).append_stream(
+        _compact_chunks(chunks, env.n_arms, summary), n_rounds, config=config
+    )
+    return summary
+
+
+def load_config(argv=None):
+    """
+    Junta DEFAULTS, o arquivo --config (se houver) e os argumentos da linha
+    de comando, nessa ordem de prioridade crescente.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--config", help="arquivo JSON com as opções abaixo")
+    parser.add_argument("--genres", nargs="+", help="nomes dos gêneros")
+    parser.add_argument("--probs", nargs="+", type=float, help="probabilidade de like de cada gênero")
+    parser.add_argument("--policies", nargs="+", choices=sorted(POLICIES), help="políticas a comparar")
+    parser.add_argument("--epsilon", type=float, help="epsilon do Epsilon-Greedy")
+    parser.add_argument("--rounds", type=int, help="rodadas por réplica")
+    parser.add_argument("--replicas", type=int, help="réplicas (sementes) por política")
+    parser.add_argument("--workers", type=int, help="processos em paralelo (padrão: nº de núcleos)")
+    parser.add_argument("--seed", type=int, help="semente base")
+    parser.add_argument("--chunk-size", dest="chunk_size", type=int, help="rodadas por bloco gravado")
+    parser.add_argument("--output", help="diretório do ResultStore")
+    args = parser.parse_args(argv)
+
+    config = dict(DEFAULTS)
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config.update(json.load(f))
+    config.update({k: v for k, v in vars(args).items() if v is not None and k != "config"})
+
+    if not config["genres"] or not config["probs"]:
+        parser.error("informe --genres e --probs (ou use --config)")
+    if len(config["genres"]) != len(config["probs"]):
+        parser.error("--genres e --probs precisam ter o mesmo tamanho")
+    unknown = set(config["policies"]) - set(POLICIES)
+    if unknown:
+        parser.error(f"políticas desconhecidas: {sorted(unknown)}")
+    return config
+
+
+def run(config):
+    """
+    Roda todas as réplicas de todas as políticas (em paralelo) e grava no
+    ResultStore. Retorna o resumo de aggregate_sweep.
+
+    A réplica i usa a mesma semente em todas as políticas, como em
+    run_sweep.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    seeds = np.random.SeedSequence(config["seed"]).spawn(config["replicas"])
+    os.makedirs(config["output"], exist_ok=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=config["workers"]) as pool:
+        futures = [
+            pool.submit(_run_replica, config["output"], list(config["genres"]),
+                        [float(p) for p in config["probs"]], policy, config["epsilon"],
+                        config["rounds"], config["chunk_size"], replica,
+                        config["seed"], seeds[replica])
+            for policy in config["policies"]
+            for replica in range(config["replicas"])
+        ]
+        for future in as_completed(futures):
+            res = future.result()
+            results.append(res)
+            print(f"{res['policy']:<16} réplica {res['seed_index']:>3}  "
+                  f"likes={res['final_reward']:.0f}  "
+                  f"melhor gênero={res['final_pct_optimal']:.1%}  run_id={res['run_id']}")
+
+    summary = aggregate_sweep(results)
+    with open(os.path.join(config["output"], "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(_json_safe({"config": config, "summary": summary}), f, indent=2, allow_nan=False)
+    return summary
+
+
+def main(argv=None):
+    config = load_config(argv)
+    for row in run(config):
+        print(f"{row['policy']:<16} likes médios={row['final_reward_mean']:.1f}  "
+              f"melhor gênero={row['final_pct_optimal_mean']:.1%}  ({row['n_seeds']} réplicas)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
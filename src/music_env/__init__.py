@@ -1 +1,2 @@
-from .music_env import MusicEnvironment
\ No newline at end of file
+from .catalog import SongCatalog, StoredSongCatalog
+from .music_env import CommonRandomEnvironment, MusicEnvironment
@@ -0,0 +1,236 @@
+import json
+import os
+from functools import lru_cache, reduce
+
+import numpy as np
+from numpy.random import default_rng
+
+
+# Bancos de palavras por gênero (não precisa ser realista, só divertido)
+WORD_BANKS = {
+    "pop": {
+        "adjs": ["Perfeito", "Impossível", "Secreto", "Inesquecível", "Eterno", "Doce",
+                 "Louco", "Brilhante", "Proibido", "Azul", "Dançante", "Veloz", "Sincero"],
+        "subs": ["Amor", "Verão", "Destino", "Coração", "Momento", "Beijo", "Noite",
+                 "Segredo", "Mensagem", "Memória", "Sonho", "Festa", "Estrela"],
+        "verbs": ["Diz", "Sente", "Chama", "Vem", "Foge", "Volta", "Explode", "Brilha"],
+        "lugares": ["Praia", "Cidade", "Pista", "Varanda", "Céu", "Elevador", "Quarto"],
+    },
+    "rock": {
+        "adjs": ["Quebrado", "Selvagem", "Elétrico", "Sombrio", "Rebelde", "Áspero",
+                 "Cruel", "Vermelho", "Infernal", "Livre", "Gigante", "Maldito"],
+        "subs": ["Silêncio", "Tempestade", "Grito", "Caos", "Estrada", "Motor", "Fumaça",
+                 "Cicatriz", "Ruína", "Noite", "Pedra", "Ferro", "Sombra"],
+        "verbs": ["Rasga", "Queima", "Late", "Cai", "Sobe", "Quebra", "Urra", "Ressoa"],
+        "lugares": ["Garagem", "Asfalto", "Deserto", "Beco", "Palco", "Subsolo"],
+    },
+    "funk": {
+        "adjs": ["Proibido", "Pesado", "Diferente", "Do Bailão", "Da Quebrada", "Malvadão",
+                 "Nervoso", "Reluzente", "Estourado", "Safado", "Gelado"],
+        "subs": ["Beat", "Bailão", "Tamborzão", "Rolê", "Mandela", "Passinho", "Revoada",
+                 "Grave", "Chão", "Fluxo", "Favela", "Vibe"],
+        "verbs": ["Desce", "Sobe", "Joga", "Bate", "Rebola", "Encosta", "Gira", "Treme"],
+        "lugares": ["Quadra", "Beco", "Baile", "Rua", "Morro", "Piscina", "Pista"],
+    },
+    "sertanejo": {
+        "adjs": ["Velho", "Doído", "Apaixonado", "Solteiro", "Sozinho", "Perdido",
+                 "Tristonho", "Bêbado", "Calado", "Valente", "Teimoso"],
+        "subs": ["Coração", "Buteco", "Interior", "Pé de Serra", "Saudade", "Estrada",
+                 "Paixão", "Chapéu", "Chuva", "Aliança", "Mensagem", "Lembrança"],
+        "verbs": ["Chora", "Liga", "Some", "Volta", "Apaixona", "Esquece", "Promete"],
+        "lugares": ["Buteco", "Rodeio", "Fazenda", "Cidadezinha", "Estrada de Terra"],
+    },
+    "mpb": {
+        "adjs": ["Doce", "Calmo", "Profundo", "Suave", "Antigo", "Sereno",
+                 "Lírico", "Morno", "Cintilante", "Tranquilo", "Vago"],
+        "subs": ["Mar", "Lua", "Café", "Saudade", "Janela", "Brisa", "Rua",
+                 "Outono", "Poesia", "Chuva", "Silêncio", "Sorriso"],
+        "verbs": ["Lembra", "Canta", "Sopra", "Flutua", "Encosta", "Abraça"],
+        "lugares": ["Varanda", "Calçada", "Praça", "Rio", "Esquina", "Barzinho"],
+    },
+    "forró": {
+        "adjs": ["Quente", "Apaixonado", "Arretado", "Do Sertão", "Do Nordeste", "Faceiro",
+                 "Safadinho", "Bonito", "Vaqueiro", "Matuto"],
+        "subs": ["Forró", "Xote", "Arrasta-pé", "São João", "Lua de Mel", "Sanfona",
+                 "Fogueira", "Chão", "Pisada", "Cangaço", "Baião"],
+        "verbs": ["Arreda", "Chega", "Chama", "Dança", "Vira", "Puxa", "Roda"],
+        "lugares": ["Arraiá", "Sertão", "Feira", "Riacho", "Vila", "Fogueira"],
+    },
+    "default": {
+        "adjs": ["Novo", "Antigo", "Secreto", "Distante", "Perdido", "Lindo",
+                 "Estranho", "Curioso", "Alto", "Baixo"],
+        "subs": ["Caminho", "Sonho", "Horizonte", "Encontro", "Sinal", "Vento",
+                 "Noite", "Luz", "Tempo"],
+        "verbs": ["Corre", "Chama", "Sobe", "Cai", "Vira", "Some"],
+        "lugares": ["Lugar Nenhum", "Qualquer Canto", "Outro Lado", "Aqui"],
+    },
+}
+
+CONNECTORS = ["e", "com", "sem", "contra", "por", "pra", "depois de", "antes de"]
+
+# Padrões de título: cada parte é um campo sorteado ou um texto fixo.
+# sub2 é um segundo substantivo e conn um conector.
+PATTERNS = [
+    ("adj", " ", "sub1"),
+    ("sub1", " ", "conn", " ", "sub2"),
+    ("verb", " ", "sub1"),
+    ("sub1", " de ", "lugar"),
+    ("adj", " ", "sub1", " de ", "lugar"),
+    ("sub1", " na ", "lugar"),
+    ("verb", " na ", "lugar"),
+    ("sub1", ": ", "adj", " ", "sub2"),
+    ("sub1", " (", "adj", ")"),
+    ("adj", " ", "sub1", " / ", "sub2"),
+    ("sub1", " do ", "adj"),
+    ("verb", " ", "conn", " ", "sub1"),
+]
+
+ROMAN_NUMERALS = [" I", " II", " III"]
+ROMAN_PROBABILITY = 0.18  # chance de um numeral romano no fim do título
+
+# Campo do padrão -> lista do banco de palavras
+_FIELDS = {"adj": "adjs", "sub1": "subs", "sub2": "subs", "verb": "verbs", "lugar": "lugares"}
+
+
+@lru_cache(maxsize=None)
+def genre_key(genre):
+    """
+    Banco de palavras usado por um gênero (ex.: "Forró", "forro" e
+    "Forró Universitário" -> "forró"). Calculado uma vez por nome.
+    """
+    genre = genre.lower()
+    for key in WORD_BANKS:
+        if key in genre or (key == "forró" and "forro" in genre):
+            return key
+    return "default"
+
+
+class SongCatalog:
+    """
+    Gerador de títulos de música por gênero.
+
+    As tabelas de palavras de cada gênero são montadas uma única vez (como
+    arrays de strings do NumPy), e titles() gera N títulos de uma vez com
+    arrays de índices, sem montar string por string em Python. title()
+    entrega um título por vez a partir de um buffer pré-gerado.
+    """
+    def __init__(self, rng=None, buffer_size=256):
+        self.rng = default_rng(rng)
+        self.buffer_size = buffer_size
+        self._connectors = np.array(CONNECTORS)
+        self._tables = {
+            key: {field: np.array(bank[words]) for field, words in _FIELDS.items()}
+            for key, bank in WORD_BANKS.items()
+        }
+        self._widths = {key: self._max_title_length(key) for key in self._tables}
+        self._buffers = {}
+
+    def titles(self, genre, n, rng=None):
+        """
+        n títulos para o gênero, num array de strings (dtype unicode).
+        """
+        rng = self.rng if rng is None else default_rng(rng)
+        key = genre_key(genre)
+        table = self._tables[key]
+
+        fields = {field: words[rng.integers(0, len(words), n)] for field, words in table.items()}
+        fields["conn"] = self._connectors[rng.integers(0, len(self._connectors), n)]
+        pattern = rng.integers(0, len(PATTERNS), n)
+
+        out = np.zeros(n, dtype=f"<U{self._widths[key]}")
+        for p, parts in enumerate(PATTERNS):
+            rows = np.flatnonzero(pattern == p)
+            if len(rows):
+                pieces = [fields[part][rows] if part in fields else part for part in parts]
+                out[rows] = reduce(np.char.add, pieces)
+
+        roman = np.flatnonzero(rng.random(n) < ROMAN_PROBABILITY)
+        numerals = np.array(ROMAN_NUMERALS)[rng.integers(0, len(ROMAN_NUMERALS), len(roman))]
+        out[roman] = np.char.add(out[roman], numerals)
+        return out
+
+    def title(self, genre):
+        """
+        Um título para o gênero (retirado de um buffer gerado em lote).
+        """
+        key = genre_key(genre)
+        buffer = self._buffers.get(key)
+        if not buffer:
+            buffer = self._buffers[key] = self.titles(key, self.buffer_size).tolist()
+        return buffer.pop()
+
+    def save(self, directory, n_per_genre, genres=None, chunk_size=1_000_000):
+        """
+        Pré-gera um catálogo persistente com n_per_genre títulos por gênero
+        (um .npy de bytes utf-8 por gênero), em blocos de chunk_size
+        títulos. Abra com StoredSongCatalog(directory).
+        """
+        keys = sorted({genre_key(g) for g in genres}) if genres else list(WORD_BANKS)
+        os.makedirs(directory, exist_ok=True)
+        index = {}
+        for key in keys:
+            width = self._max_title_length(key, encoding="utf-8")
+            path = os.path.join(directory, f"{key}.npy")
+            songs = np.lib.format.open_memmap(path, mode="w+", dtype=f"S{width}", shape=(n_per_genre,))
+            for start in range(0, n_per_genre, chunk_size):
+                stop = min(start + chunk_size, n_per_genre)
+                songs[start:stop] = np.char.encode(self.titles(key, stop - start), "utf-8")
+            songs.flush()
+            index[key] = {"file": f"{key}.npy", "n_songs": n_per_genre}
+        with open(os.path.join(directory, "catalog.json"), "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        return StoredSongCatalog(directory)
+
+    def _max_title_length(self, key, encoding=None):
+        # Maior título possível do gênero, em caracteres (ou em bytes, se
+        # encoding for dado)
+        def size(word):
+            return len(word.encode(encoding)) if encoding else len(word)
+
+        def longest(words):
+            return max(size(w) for w in words.tolist())
+
+        lengths = {field: longest(words) for field, words in self._tables[key].items()}
+        lengths["conn"] = longest(self._connectors)
+        pattern_length = max(
+            sum(lengths[part] if part in lengths else size(part) for part in parts)
+            for parts in PATTERNS
+        )
+        return pattern_length + max(size(r) for r in ROMAN_NUMERALS)
+
+
+class StoredSongCatalog:
+    """
+    Catálogo pré-gerado por SongCatalog.save(). Os títulos ficam em disco
+    (memmap) e são lidos sob demanda, sem montar strings por requisição.
+    """
+    def __init__(self, directory, rng=None):
+        self.directory = directory
+        self.rng = default_rng(rng)
+        with open(os.path.join(directory, "catalog.json"), encoding="utf-8") as f:
+            self.index = json.load(f)
+        self._open = {}
+
+    def songs(self, genre):
+        """
+        Array (memmap, bytes utf-8) com todos os títulos do gênero.
+        """
+        key = genre_key(genre)
+        if key not in self.index:
+            key = "default" if "default" in self.index else next(iter(self.index))
+        if key not in self._open:
+            path = os.path.join(self.directory, self.index[key]["file"])
+            self._open[key] = np.load(path, mmap_mode="r")
+        return self._open[key]
+
+    def __len__(self):
+        return sum(entry["n_songs"] for entry in self.index.values())
+
+    def title(self, genre, song_id=None):
+        """
+        Título da música song_id do gênero (ou de uma música sorteada).
+        """
+        songs = self.songs(genre)
+        if song_id is None:
+            song_id = self.rng.integers(0, len(songs))
+        return songs[song_id].decode("utf-8")
@@ -1,4 +1,7 @@
-from numpy import array, random
+from copy import copy
+
+from numpy import arange, array, asarray, empty, packbits, uint8
+from numpy.random import default_rng
 
 
 class MusicEnvironment:
@@ -7,14 +10,26 @@ class MusicEnvironment:
 
     Cada "braço" é um gênero. Opcionalmente, o ambiente pode ter
     probabilidades verdadeiras de like (para o modo simulado).
+
+    O ambiente tem seu próprio gerador (numpy.random.Generator), então
+    várias simulações podem rodar intercaladas ou em paralelo com
+    resultados determinísticos.
     """
-    def __init__(self, genres, probs=None):
+    def __init__(self, genres, probs=None, rng=None, buffer_size=4096):
         """
         genres: lista de strings com os nomes dos gêneros
         probs: lista com as probabilidades verdadeiras de like (ou None)
+        rng: semente, Generator ou None (gerador próprio do ambiente)
+        buffer_size: quantos sorteios uniformes são pré-gerados de uma vez
         """
         self.genres = list(genres)
         self.n_arms = len(genres)
+        self.rng = default_rng(rng)
+        self.buffer_size = buffer_size
+
+        # Sorteios uniformes pré-gerados, consumidos por pull/pull_batch
+        self._uniforms = empty(0)
+        self._pos = 0
 
         if probs is None:
             self.probs = None
@@ -24,6 +39,22 @@ class MusicEnvironment:
     def has_true_probs(self):
         return self.probs is not None
 
+    def _check_probs(self):
+        if self.probs is None:
+            raise ValueError(
+                "Este ambiente não tem probabilidades verdadeiras definidas. "
+                "Use input humano (modo ao vivo) em vez de env.pull()."
+            )
+
+    def _draw_uniforms(self, n):
+        # Retira n sorteios do buffer, renovando-o quando não há o suficiente
+        if self._pos + n > len(self._uniforms):
+            self._uniforms = self.rng.random(max(n, self.buffer_size))
+            self._pos = 0
+        uniforms = self._uniforms[self._pos:self._pos + n]
+        self._pos += n
+        return uniforms
+
     def pull(self, arm):
         """
         Recomenda o gênero 'arm' e retorna 1 (like) caso o valor aleatorio
@@ -32,12 +63,110 @@ class MusicEnvironment:
 
         Só deve ser usado no modo simulado.
         """
-        if self.probs is None:
+        self._check_probs()
+
+        if self._pos >= len(self._uniforms):
+            self._uniforms = self.rng.random(self.buffer_size)
+            self._pos = 0
+        u = self._uniforms[self._pos]
+        self._pos += 1
+
+        p = self.probs[arm]
+
+        return 1 if u < p else 0
+
+    def pull_batch(self, arms):
+        """
+        Versão vetorizada de pull: recomenda cada gênero de 'arms' e retorna
+        um array de 0/1, com todos os sorteios feitos de uma vez.
+        """
+        self._check_probs()
+        arms = asarray(arms, dtype=int)
+        return (self._draw_uniforms(arms.size).reshape(arms.shape) < self.probs[arms]).astype(int)
+
+    def _snapshot_state(self):
+        # Estado do gerador + sorteios ainda não consumidos (para checkpoints)
+        meta = {"rng": self.rng.bit_generator.state, "pos": self._pos}
+        return meta, {"uniforms": self._uniforms}
+
+    def _restore_state(self, meta, arrays):
+        self.rng.bit_generator.state = meta["rng"]
+        self._uniforms = array(arrays["uniforms"])
+        self._pos = meta["pos"]
+
+
+class CommonRandomEnvironment(MusicEnvironment):
+    """
+    Ambiente com "números aleatórios comuns" para comparar políticas.
+
+    Os resultados (like/dislike) de TODOS os gêneros em cada rodada são
+    sorteados uma única vez numa tabela (n_rounds x n_arms), guardada com
+    1 bit por resultado. Cada política recebe uma cópia do ambiente via
+    fork(), que compartilha a tabela mas tem seu próprio contador de
+    rodadas: na rodada t, recomendar o gênero g sempre dá o mesmo
+    resultado, qualquer que seja a política. Isso reduz a variância da
+    comparação entre políticas.
+    """
+    def __init__(self, genres, probs, n_rounds, rng=None, chunk_rounds=65_536):
+        super().__init__(genres, probs, rng=rng)
+        self._check_probs()
+        self.n_rounds = n_rounds
+
+        # Sorteia em blocos de rodadas para não alocar a tabela em float64
+        self._table = empty((n_rounds, (self.n_arms + 7) // 8), dtype=uint8)
+        for start in range(0, n_rounds, chunk_rounds):
+            stop = min(start + chunk_rounds, n_rounds)
+            outcomes = self.rng.random((stop - start, self.n_arms)) < self.probs
+            self._table[start:stop] = packbits(outcomes, axis=1)
+        self._t = 0
+
+    def fork(self):
+        """
+        Nova cópia do ambiente, começando da rodada 0, que lê a mesma
+        tabela de resultados (sem copiá-la).
+        """
+        env = copy(self)
+        env._t = 0
+        return env
+
+    def _take_rounds(self, n):
+        if self._t + n > self.n_rounds:
             raise ValueError(
-                "Este ambiente não tem probabilidades verdadeiras definidas. "
-                "Use input humano (modo ao vivo) em vez de env.pull()."
+                f"A tabela de resultados tem só {self.n_rounds} rodadas. "
+                "Crie o ambiente com n_rounds maior."
             )
+        start = self._t
+        self._t += n
+        return start
 
-        p = self.probs[arm]
+    def pull(self, arm):
+        """
+        Resultado da rodada atual para o gênero 'arm', lido da tabela.
+        """
+        t = self._take_rounds(1)
+        return int((self._table[t, arm >> 3] >> (7 - (arm & 7))) & 1)
+
+    def pull_batch(self, arms):
+        """
+        Resultados de len(arms) rodadas consecutivas: arms[i] é o gênero
+        recomendado na i-ésima delas.
+        """
+        arms = asarray(arms, dtype=int)
+        start = self._take_rounds(arms.size)
+        rows = arange(start, start + arms.size)
+        flat = arms.ravel()
+        bits = (self._table[rows, flat >> 3] >> (7 - (flat & 7))) & 1
+        return bits.astype(int).reshape(arms.shape)
+
+    def _snapshot_state(self):
+        # A tabela não vai para o snapshot: ela é refeita pelo construtor a
+        # partir da mesma semente. Só a rodada atual precisa ser guardada.
+        meta, arrays = super()._snapshot_state()
+        meta.update(t=self._t, n_rounds=self.n_rounds)
+        return meta, arrays
 
-        return 1 if random.rand() < p else 0
\ No newline at end of file
+    def _restore_state(self, meta, arrays):
+        if meta["n_rounds"] != self.n_rounds:
+            raise ValueError("O snapshot é de um ambiente com outro número de rodadas.")
+        super()._restore_state(meta, arrays)
+        self._t = meta["t"]
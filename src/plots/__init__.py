@@ -1,7 +1,16 @@
-from .plots import (
-    compute_counts_and_means, 
-    fig_cumulative_reward_all, 
-    fig_pct_optimal_all,
-    fig_genre_usage, 
-    fig_mean_estimates
-)
\ No newline at end of file
+# As figuras dependem do Plotly, que só é importado quando uma delas é usada
+# (import leve para quem só roda simulações).
+__all__ = [
+    "compute_counts_and_means",
+    "fig_cumulative_reward_all",
+    "fig_pct_optimal_all",
+    "fig_genre_usage",
+    "fig_mean_estimates",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import plots
+        return getattr(plots, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,33 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 
-
-def compute_counts_and_means(n_arms, chosen_arms, rewards):
-    """
-    A partir do histórico, calcula:
-    - tentativas por gênero
-    - likes por gênero
-    - média de likes por gênero
-    """
-    chosen_arms = np.array(chosen_arms, dtype=int)
-    rewards = np.array(rewards, dtype=float)
-
-    counts = np.zeros(n_arms, dtype=int)
-    likes = np.zeros(n_arms, dtype=float)
-    means = np.zeros(n_arms, dtype=float)
-
-    for arm in range(n_arms):
-        mask = (chosen_arms == arm)
-        counts[arm] = mask.sum()
-        if counts[arm] > 0:
-            likes[arm] = rewards[mask].sum()
-            means[arm] = likes[arm] / counts[arm]
-        else:
-            likes[arm] = 0
-            means[arm] = 0.0
-
-    return counts, likes, means
+from ..utils.utils import compute_counts_and_means
 
 
 # def fig_cumulative_reward_all(resultados, titulo="Recompensa acumulada"):
@@ -79,17 +53,70 @@ def compute_counts_and_means(n_arms, chosen_arms, rewards):
 #     fig.tight_layout()
 #     return fig
 
-def fig_cumulative_reward_all(resultados, titulo="Recompensa acumulada"):
+# Curvas longas são reduzidas a no máximo MAX_POINTS pontos (mantendo o
+# formato) e, acima de WEBGL_THRESHOLD pontos, desenhadas com WebGL. O
+# limite do WebGL fica abaixo do orçamento da decimação, então toda curva
+# decimada (e toda simulação com mais de WEBGL_THRESHOLD rodadas) usa WebGL.
+MAX_POINTS = 2000
+WEBGL_THRESHOLD = 1000
+
+
+def _decimate(x, y, max_points):
+    """
+    Decimação min/max: divide a curva em max_points // 2 faixas e mantém,
+    de cada uma, o ponto mínimo e o máximo (em ordem), além do primeiro e
+    do último ponto. Picos e vales continuam visíveis.
+    """
+    n = len(y)
+    size = -(-n // max(max_points // 2, 1))  # pontos por faixa
+    full = (n // size) * size
+
+    buckets = np.asarray(y[:full]).reshape(-1, size)
+    offsets = np.arange(0, full, size)
+    idx = [offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1)]
+    if full < n:
+        tail = np.asarray(y[full:])
+        idx.append(np.array([full + tail.argmin(), full + tail.argmax()]))
+    idx = np.unique(np.concatenate(idx + [np.array([0, n - 1])]))
+
+    return x[idx], np.asarray(y[idx])
+
+
+def _curve(res, key, rounds=None, max_points=MAX_POINTS):
+    """
+    Curva 'key' de um resultado, opcionalmente só o trecho 'rounds'
+    (um slice) e decimada para no máximo ~max_points pontos (None = todos).
+    Com resultados do ResultStore (memmap), só o trecho pedido é lido do
+    disco.
+    """
+    y = res[key]
+    if rounds is not None:
+        start, stop, step = rounds.indices(len(y))
+        x = np.arange(start, stop, step)
+        y = y[rounds]
+    elif max_points is not None and len(y) > max_points:
+        x = np.arange(len(y))
+    else:
+        return None, y
+
+    if max_points is not None and len(y) > max_points:
+        return _decimate(x, y, max_points)
+    return x, np.asarray(y)
+
+
+def _line_trace(x, y, name):
+    # Scattergl (WebGL) aguenta muito mais pontos sem travar o navegador
+    trace_cls = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    return trace_cls(x=x, y=y, mode="lines", name=name)
+
+
+def fig_cumulative_reward_all(resultados, titulo="Recompensa acumulada", rounds=None,
+                              max_points=MAX_POINTS):
     fig = go.Figure()
 
     for nome, res in resultados.items():
-        fig.add_trace(
-            go.Scatter(
-                y=res["cumulative_reward"],
-                mode="lines",
-                name=nome
-            )
-        )
+        x, y = _curve(res, "cumulative_reward", rounds, max_points)
+        fig.add_trace(_line_trace(x, y, nome))
 
     fig.update_layout(
         title=titulo,
@@ -109,17 +136,13 @@ def fig_cumulative_reward_all(resultados, titulo="Recompensa acumulada"):
     return fig
 
 
-def fig_pct_optimal_all(resultados, titulo="% de escolhas do melhor gênero"):
+def fig_pct_optimal_all(resultados, titulo="% de escolhas do melhor gênero", rounds=None,
+                        max_points=MAX_POINTS):
     fig = go.Figure()
 
     for nome, res in resultados.items():
-        fig.add_trace(
-            go.Scatter(
-                y=res["pct_optimal"],
-                mode="lines",
-                name=nome
-            )
-        )
+        x, y = _curve(res, "pct_optimal", rounds, max_points)
+        fig.add_trace(_line_trace(x, y, nome))
 
     fig.update_layout(
         title=titulo,
@@ -139,8 +162,10 @@ def fig_pct_optimal_all(resultados, titulo="% de escolhas do melhor gênero"):
     return fig
 
 
-def fig_genre_usage(genres, chosen_arms, titulo="Uso de cada gênero"):
-    counts = np.bincount(chosen_arms, minlength=len(genres))
+def fig_genre_usage(genres, chosen_arms=None, titulo="Uso de cada gênero", counts=None):
+    # counts (tentativas por gênero) pode vir pronto, sem varrer o histórico
+    if counts is None:
+        counts = np.bincount(chosen_arms, minlength=len(genres))
     total = counts.sum()
     proporcoes = counts / total if total > 0 else np.zeros_like(counts, dtype=float)
 
@@ -170,8 +195,10 @@ def fig_genre_usage(genres, chosen_arms, titulo="Uso de cada gênero"):
     return fig
 
 
-def fig_mean_estimates(genres, chosen_arms, rewards, titulo="Média de likes por gênero"):
-    counts, likes, means = compute_counts_and_means(len(genres), chosen_arms, rewards)
+def fig_mean_estimates(genres, chosen_arms=None, rewards=None, titulo="Média de likes por gênero", means=None):
+    # means (média por gênero) pode vir pronto, sem varrer o histórico
+    if means is None:
+        counts, likes, means = compute_counts_and_means(len(genres), chosen_arms, rewards)
 
     fig = go.Figure(
         data=[
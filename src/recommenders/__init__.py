@@ -1,3 +1,6 @@
 from .epsilon_greedy import EpsilonGreedyRecommender
+from .hierarchical import HierarchicalRecommender
 from .random_rec import RandomRecommender
-from .ucb import UCBRecommender
\ No newline at end of file
+from .session_store import BanditSessionStore
+from .thompson import ThompsonSamplingRecommender
+from .ucb import UCBRecommender
@@ -0,0 +1,54 @@
+from array import array
+
+from numpy import arange, asarray, full, inf, where
+
+
+class ArgmaxTree:
+    """
+    Árvore de torneio (segment tree) sobre um vetor de valores.
+
+    Cada nó guarda o índice do maior valor da sua subárvore, então a raiz
+    é sempre o argmax do vetor inteiro. Atualizar um valor custa O(log K)
+    e consultar o argmax custa O(1). Empates ficam com o menor índice,
+    igual a numpy.argmax.
+
+    Valores e nós ficam em array.array (8 bytes por item, sem um objeto
+    Python por posição), com acesso item a item tão rápido quanto o de
+    uma lista.
+    """
+    def __init__(self, values):
+        values = asarray(values, dtype=float)
+        self.n = len(values)
+        self.size = 1
+        while self.size < max(self.n, 1):
+            self.size *= 2
+
+        # Folhas extras (preenchimento) nunca vencem
+        padded = full(self.size, -inf)
+        padded[:self.n] = values
+        self._values = array("d", padded.tobytes())
+
+        # tree[size + i] = i; tree[node] = vencedor entre os filhos
+        tree = full(2 * self.size, 0, dtype="int64")
+        tree[self.size:] = arange(self.size)
+        level = tree[self.size:]
+        start = self.size
+        while start > 1:
+            left, right = level[0::2], level[1::2]
+            level = where(padded[left] >= padded[right], left, right)
+            start //= 2
+            tree[start:2 * start] = level
+        self._tree = array("q", tree.tobytes())
+
+    @property
+    def best(self):
+        return self._tree[1]
+
+    def update(self, i, value):
+        values, tree = self._values, self._tree
+        values[i] = value
+        node = (i + self.size) // 2
+        while node >= 1:
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if values[left] >= values[right] else right
+            node //= 2
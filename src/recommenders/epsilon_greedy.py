@@ -1,4 +1,8 @@
-from numpy import zeros, random, argmax
+from numpy import zeros, argmax, asarray, bincount, full, flatnonzero
+from numpy.random import default_rng
+
+from .argmax_tree import ArgmaxTree
+from .snapshot import load_snapshot, save_snapshot
 
 
 class EpsilonGreedyRecommender:
@@ -8,24 +12,99 @@ class EpsilonGreedyRecommender:
     epsilon = probabilidade de EXPLORAR (escolher um braço aleatório).
     (1 - epsilon) = probabilidade de EXPLORAR O MELHOR conhecido
     (escolher o braço com maior média de recompensa).
+
+    indexed=True mantém o melhor braço numa árvore de torneio (ArgmaxTree):
+    cada update custa O(log K) e a explotação O(1), em vez do argmax O(K).
+    Compensa para catálogos grandes (veja benchmarks/bench_argmax.py).
     """
-    def __init__(self, n_arms, epsilon):
+    def __init__(self, n_arms, epsilon, indexed=False, rng=None):
         self.n_arms = n_arms
+        self.rng = default_rng(rng)  # Gerador próprio (semente, Generator ou None)
         self.epsilon = epsilon  # Probabilidade de exploração
         self.counts = zeros(n_arms)  # Número de vezes que cada filme foi recomendado
         self.values = zeros(n_arms)  # Valor esperado de recompensa para cada filme
+        self.indexed = indexed
+        self._tree = ArgmaxTree(self.values) if indexed else None
 
     def select_arm(self):
         # Com probabilidade epsilon, fazemos uma escolha aleatória (exploração)
-        if random.random() < self.epsilon:
-            return random.randint(0, self.n_arms)
+        if self.rng.random() < self.epsilon:
+            return self.rng.integers(0, self.n_arms)
         # Caso contrário, fazemos explotação
+        return self._best_arm()
+
+    def _best_arm(self):
+        if self.indexed:
+            return self._tree.best
         return argmax(self.values)
 
+    def select_arms(self, n):
+        # n recomendações de uma vez, todas com as estimativas atuais
+        arms = full(n, self._best_arm())
+        explore = self.rng.random(n) < self.epsilon
+        arms[explore] = self.rng.integers(0, self.n_arms, size=int(explore.sum()))
+        return arms
+
     def update(self, chosen_arm, reward):
         # Atualiza as estimativas do braço selecionado com base na recompensa observada
         self.counts[chosen_arm] += 1
         n = self.counts[chosen_arm]
         value = self.values[chosen_arm]
         new_value = ((n - 1) / n) * value + (1 / n) * reward
-        self.values[chosen_arm] = new_value
\ No newline at end of file
+        self.values[chosen_arm] = new_value
+
+        if self.indexed:
+            self._tree.update(int(chosen_arm), float(new_value))
+
+    def update_batch(self, chosen_arms, rewards):
+        # Aplica um lote de recompensas de uma vez (mesmo resultado de
+        # chamar update() em sequência para cada par braço/recompensa)
+        chosen_arms = asarray(chosen_arms, dtype=int)
+        n_new = bincount(chosen_arms, minlength=self.n_arms)
+        reward_sums = bincount(chosen_arms, weights=rewards, minlength=self.n_arms)
+        updated = n_new > 0
+        self.counts[updated] += n_new[updated]
+        self.values[updated] += (
+            reward_sums[updated] - n_new[updated] * self.values[updated]
+        ) / self.counts[updated]
+
+        if self.indexed:
+            if updated.sum() > self.n_arms // 8:
+                self._tree = ArgmaxTree(self.values)  # Reconstruir sai mais barato
+            else:
+                for arm in flatnonzero(updated):
+                    self._tree.update(int(arm), float(self.values[arm]))
+
+    # ---------- Snapshots ----------
+
+    def _snapshot_state(self):
+        meta = {"n_arms": self.n_arms, "epsilon": self.epsilon, "indexed": self.indexed,
+                "rng": self.rng.bit_generator.state}
+        return meta, {"counts": self.counts, "values": self.values}
+
+    def _restore_state(self, meta, arrays):
+        self.epsilon = meta["epsilon"]
+        self.rng.bit_generator.state = meta["rng"]
+        self.counts = arrays["counts"]
+        self.values = arrays["values"]
+        if self.indexed:
+            self._tree = ArgmaxTree(self.values)
+
+    def save(self, path):
+        """
+        Grava counts, values, epsilon e o estado do gerador num snapshot
+        binário (veja snapshot.py).
+        """
+        save_snapshot(path, type(self).__name__, *self._snapshot_state())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Recria o recomendador salvo com save(). Com mmap=True counts e
+        values são mapeados do arquivo (copy-on-write), sem cópia.
+        """
+        _, meta, arrays = load_snapshot(path, mmap=mmap, kind=cls.__name__)
+        policy = cls(meta["n_arms"], epsilon=meta["epsilon"])
+        policy.indexed = meta["indexed"]
+        policy._restore_state(meta, arrays)
+        return policy
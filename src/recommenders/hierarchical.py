@@ -0,0 +1,116 @@
+from numpy import arange, argsort, asarray, bincount, concatenate, cumsum, empty, flatnonzero, zeros
+from numpy.random import default_rng
+
+from .epsilon_greedy import EpsilonGreedyRecommender
+from .ucb import UCBRecommender
+
+
+class HierarchicalRecommender:
+    """
+    Recomendador em dois níveis para catálogos grandes: primeiro escolhe o
+    gênero com uma política comum (UCBRecommender, EpsilonGreedyRecommender)
+    e depois a música dentro do gênero, com um bandit próprio por gênero.
+
+    O estado das músicas fica em dois arrays contíguos, ordenados por
+    gênero: as músicas do gênero g ocupam o trecho offsets[g]:offsets[g + 1],
+    e o bandit do gênero g trabalha sobre uma view desse trecho. Assim cada
+    recomendação só olha os gêneros e o índice das músicas do gênero
+    escolhido, nunca o catálogo inteiro. counts e values devolvem esse
+    estado na ordem das músicas (cópias somente leitura).
+
+    Memória por música: 16 bytes de estado (contagem e média) e 16 dos
+    mapas música <-> posição. O modo indexado soma 8 bytes no UCB e de 24
+    a 48 no Epsilon-Greedy (árvore de torneio, arredondada para potência
+    de 2), mais as entradas das músicas já testadas.
+
+    genre_of_song: gênero (0..n_genres-1) de cada música; os braços deste
+                   recomendador são os índices das músicas
+    genre_policy: política dos gêneros (padrão: UCBRecommender)
+    song_policy: "ucb" ou "epsilon_greedy" (bandit dentro de cada gênero)
+    indexed: usa o modo indexado das políticas de música (escolha
+             sublinear no tamanho do gênero, ao custo de alguma memória
+             extra por música já testada)
+    """
+    def __init__(self, genre_of_song, genre_policy=None, song_policy="ucb", epsilon=0.1,
+                 indexed=True, rng=None):
+        if song_policy not in ("ucb", "epsilon_greedy"):
+            raise ValueError(f"Política desconhecida: {song_policy}. Use 'ucb' ou 'epsilon_greedy'.")
+        self.rng = default_rng(rng)
+        self.genre_of_song = asarray(genre_of_song, dtype=int)
+        self.n_arms = len(self.genre_of_song)
+        sizes = bincount(self.genre_of_song)
+        if (sizes == 0).any():
+            raise ValueError("Todo gênero precisa ter pelo menos uma música.")
+        self.n_genres = len(sizes)
+
+        # Músicas ordenadas por gênero: song_ids[pos] é a música na posição pos
+        self.song_ids = argsort(self.genre_of_song, kind="stable")
+        self.offsets = concatenate([[0], cumsum(sizes)])
+        self._position = empty(self.n_arms, dtype=int)
+        self._position[self.song_ids] = arange(self.n_arms)
+
+        self._counts = zeros(self.n_arms)  # Na ordem de song_ids, não dos índices das músicas
+        self._values = zeros(self.n_arms)
+
+        rngs = self.rng.spawn(self.n_genres + 1)
+        self.genre_policy = genre_policy or UCBRecommender(self.n_genres, rng=rngs[-1])
+        self.song_policies = []
+        for g in range(self.n_genres):
+            lo, hi = self.offsets[g], self.offsets[g + 1]
+            if song_policy == "ucb":
+                policy = UCBRecommender(hi - lo, indexed=indexed, rng=rngs[g])
+            else:
+                policy = EpsilonGreedyRecommender(hi - lo, epsilon=epsilon, indexed=indexed, rng=rngs[g])
+            # Ainda tudo zerado: trocar pelos trechos contíguos não muda o estado
+            policy.counts = self._counts[lo:hi]
+            policy.values = self._values[lo:hi]
+            self.song_policies.append(policy)
+
+    @property
+    def counts(self):
+        # Escolhas de cada música, indexadas pela música (counts[song])
+        counts = self._counts[self._position]
+        counts.setflags(write=False)
+        return counts
+
+    @property
+    def values(self):
+        # Média de likes de cada música, indexada pela música
+        values = self._values[self._position]
+        values.setflags(write=False)
+        return values
+
+    def _select_in_genre(self, genre):
+        local = self.song_policies[genre].select_arm()
+        return int(self.song_ids[self.offsets[genre] + local])
+
+    def select_arm(self):
+        return self._select_in_genre(int(self.genre_policy.select_arm()))
+
+    def select_arms(self, n):
+        # n recomendações de uma vez: gêneros em lote, depois músicas por gênero
+        genres = asarray(self.genre_policy.select_arms(n), dtype=int)
+        songs = empty(n, dtype=int)
+        for genre in range(self.n_genres):
+            rows = flatnonzero(genres == genre)
+            if len(rows):
+                local = asarray(self.song_policies[genre].select_arms(len(rows)), dtype=int)
+                songs[rows] = self.song_ids[self.offsets[genre] + local]
+        return songs
+
+    def update(self, song, reward):
+        genre = self.genre_of_song[song]
+        self.genre_policy.update(genre, reward)
+        self.song_policies[genre].update(self._position[song] - self.offsets[genre], reward)
+
+    def update_batch(self, songs, rewards):
+        # Mesmo resultado de update() em sequência, agrupando por gênero
+        songs = asarray(songs, dtype=int)
+        rewards = asarray(rewards, dtype=float)
+        genres = self.genre_of_song[songs]
+        self.genre_policy.update_batch(genres, rewards)
+        for genre in range(self.n_genres):
+            rows = flatnonzero(genres == genre)
+            if len(rows):
+                local = self._position[songs[rows]] - self.offsets[genre]
+                self.song_policies[genre].update_batch(local, rewards[rows])
@@ -1,4 +1,6 @@
-from numpy import random
+from numpy.random import default_rng
+
+from .snapshot import load_snapshot, save_snapshot
 
 
 class RandomRecommender:
@@ -6,12 +8,38 @@ class RandomRecommender:
     Algortimo que escolhe gêneros totalmente aleatoriamente.
     Serve como baseline / comparação.
     """
-    def __init__(self, n_arms):
+    def __init__(self, n_arms, rng=None):
         self.n_arms = n_arms
+        self.rng = default_rng(rng)  # Gerador próprio (semente, Generator ou None)
 
     def select_arm(self):
-        return random.randint(self.n_arms)
+        return self.rng.integers(0, self.n_arms)
+
+    def select_arms(self, n):
+        return self.rng.integers(0, self.n_arms, size=n)
 
     def update(self, arm, reward):
         # Não aprende nada
-        pass
\ No newline at end of file
+        pass
+
+    def update_batch(self, arms, rewards):
+        # Não aprende nada
+        pass
+
+    # ---------- Snapshots ----------
+
+    def _snapshot_state(self):
+        return {"n_arms": self.n_arms, "rng": self.rng.bit_generator.state}, {}
+
+    def _restore_state(self, meta, arrays):
+        self.rng.bit_generator.state = meta["rng"]
+
+    def save(self, path):
+        save_snapshot(path, type(self).__name__, *self._snapshot_state())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        _, meta, arrays = load_snapshot(path, mmap=mmap, kind=cls.__name__)
+        policy = cls(meta["n_arms"])
+        policy._restore_state(meta, arrays)
+        return policy
@@ -0,0 +1,215 @@
+from collections import OrderedDict
+
+from numpy import zeros, sqrt, log, argmax, asarray, add, flatnonzero, unique, where
+from numpy.random import default_rng
+
+from .epsilon_greedy import EpsilonGreedyRecommender
+from .snapshot import load_snapshot, save_snapshot
+from .ucb import UCBRecommender
+
+
+class BanditSessionStore:
+    """
+    Estado de muitos recomendadores independentes (um por sessão, turma ou
+    usuário) guardado em matrizes (S x K) em vez de um objeto por sessão.
+
+    - Cada sessão ocupa uma linha ("slot") de counts/values; a busca por
+      session_id é O(1) (dicionário id -> slot).
+    - select/update recebem um lote de sessões e rodam vetorizados.
+    - No máximo max_sessions ficam em memória: ao abrir uma sessão nova
+      com o armazém cheio, a sessão usada há mais tempo é descartada (LRU).
+
+    Cada sessão usa "epsilon_greedy" ou "ucb", com as mesmas regras de
+    EpsilonGreedyRecommender e UCBRecommender (modo denso).
+    """
+    POLICIES = ("epsilon_greedy", "ucb")
+
+    def __init__(self, n_arms, max_sessions=1024, policy="epsilon_greedy", epsilon=0.1, rng=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política desconhecida: {policy}. Use uma de {list(self.POLICIES)}.")
+        self.n_arms = n_arms
+        self.max_sessions = max_sessions
+        self.policy = policy  # Política padrão de sessões novas
+        self.epsilon = epsilon
+        self.rng = default_rng(rng)
+
+        self.counts = zeros((max_sessions, n_arms))
+        self.values = zeros((max_sessions, n_arms))
+        self.total_counts = zeros(max_sessions, dtype=int)
+        self._is_ucb = zeros(max_sessions, dtype=bool)
+        self._epsilons = zeros(max_sessions)
+
+        self._slots = OrderedDict()  # session_id -> slot, do menos ao mais recente
+        self._free = list(range(max_sessions - 1, -1, -1))
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, session_id):
+        return session_id in self._slots
+
+    def open(self, session_id, policy=None, epsilon=None):
+        """
+        Garante que a sessão existe (criando-a zerada se preciso) e retorna
+        o slot dela.
+        """
+        slot = self._slots.get(session_id)
+        if slot is not None:
+            self._slots.move_to_end(session_id)
+            return slot
+
+        policy = policy or self.policy
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política desconhecida: {policy}. Use uma de {list(self.POLICIES)}.")
+        if not self._free:
+            _, old_slot = self._slots.popitem(last=False)
+            self._free.append(old_slot)
+            self.evictions += 1
+
+        slot = self._free.pop()
+        self.counts[slot] = 0
+        self.values[slot] = 0
+        self.total_counts[slot] = 0
+        self._is_ucb[slot] = policy == "ucb"
+        self._epsilons[slot] = self.epsilon if epsilon is None else epsilon
+        self._slots[session_id] = slot
+        return slot
+
+    def close(self, session_id):
+        # Libera o slot da sessão (ex.: turma encerrada)
+        slot = self._slots.pop(session_id, None)
+        if slot is not None:
+            self._free.append(slot)
+
+    def _open_many(self, session_ids):
+        if len(set(session_ids)) > self.max_sessions:
+            raise ValueError("O lote tem mais sessões distintas que max_sessions.")
+        return asarray([self.open(sid) for sid in session_ids], dtype=int)
+
+    def select(self, session_ids):
+        """
+        Um braço por sessão do lote (sessões desconhecidas são abertas com
+        a política padrão). Retorna um array de braços.
+        """
+        slots = self._open_many(session_ids)
+        n = len(slots)
+        counts = self.counts[slots]
+        values = self.values[slots]
+        totals = self.total_counts[slots]
+        is_ucb = self._is_ucb[slots]
+
+        # Epsilon-Greedy: argmax dos values, com exploração aleatória
+        arms = argmax(values, axis=1)
+        explore = ~is_ucb & (self.rng.random(n) < self._epsilons[slots])
+
+        # UCB1: values + bônus; sem nenhuma escolha ainda, braço aleatório
+        ucb_rows = flatnonzero(is_ucb & (totals > 0))
+        if len(ucb_rows):
+            bonus = sqrt(2 * log(totals[ucb_rows])[:, None] / (counts[ucb_rows] + 1e-5))
+            arms[ucb_rows] = argmax(values[ucb_rows] + bonus, axis=1)
+        explore |= is_ucb & (totals == 0)
+
+        arms[explore] = self.rng.integers(0, self.n_arms, size=int(explore.sum()))
+        return arms
+
+    def select_arm(self, session_id):
+        return int(self.select([session_id])[0])
+
+    def update(self, session_ids, chosen_arms, rewards):
+        """
+        Aplica um lote de recompensas (uma por par sessão/braço). Mesmo
+        resultado de chamar update() em sequência em cada recomendador.
+        Feedback de sessões já descartadas pelo LRU é ignorado.
+        """
+        known = asarray([sid in self._slots for sid in session_ids], dtype=bool)
+        if not known.any():
+            return
+        slots = []
+        for sid in session_ids:
+            if sid in self._slots:
+                self._slots.move_to_end(sid)
+                slots.append(self._slots[sid])
+        slots = asarray(slots, dtype=int)
+        chosen_arms = asarray(chosen_arms, dtype=int)[known]
+        rewards = asarray(rewards, dtype=float)[known]
+
+        # Soma por (slot, braço): a mesma sessão pode aparecer várias vezes
+        cells, inverse = unique(slots * self.n_arms + chosen_arms, return_inverse=True)
+        n_new = zeros(len(cells))
+        reward_sums = zeros(len(cells))
+        add.at(n_new, inverse, 1)
+        add.at(reward_sums, inverse, rewards)
+        rows, cols = cells // self.n_arms, cells % self.n_arms
+
+        self.counts[rows, cols] += n_new
+        n = self.counts[rows, cols]
+        value = self.values[rows, cols]
+        # Um único feedback por célula (o caso comum) usa a mesma conta de
+        # update(), para que os empates sejam desfeitos igual
+        self.values[rows, cols] = where(
+            n_new == 1,
+            ((n - 1) / n) * value + (1 / n) * reward_sums,
+            value + (reward_sums - n_new * value) / n,
+        )
+        add.at(self.total_counts, slots, 1)
+
+    def export(self, session_id):
+        """
+        Cópia da sessão como um recomendador comum
+        (EpsilonGreedyRecommender ou UCBRecommender).
+        """
+        slot = self._slots[session_id]
+        if self._is_ucb[slot]:
+            policy = UCBRecommender(self.n_arms, rng=self.rng.spawn(1)[0])
+            policy.total_counts = int(self.total_counts[slot])
+        else:
+            policy = EpsilonGreedyRecommender(self.n_arms, epsilon=float(self._epsilons[slot]),
+                                              rng=self.rng.spawn(1)[0])
+        policy.counts[:] = self.counts[slot]
+        policy.values[:] = self.values[slot]
+        return policy
+
+    @property
+    def nbytes(self):
+        return (self.counts.nbytes + self.values.nbytes + self.total_counts.nbytes
+                + self._is_ucb.nbytes + self._epsilons.nbytes)
+
+    # ---------- Snapshots ----------
+
+    def save(self, path):
+        """
+        Grava todas as sessões num snapshot binário (veja snapshot.py).
+        Os session_ids precisam ser str ou int (vão para o cabeçalho JSON).
+        """
+        meta = {
+            "n_arms": self.n_arms, "max_sessions": self.max_sessions,
+            "policy": self.policy, "epsilon": self.epsilon,
+            "rng": self.rng.bit_generator.state, "evictions": self.evictions,
+            "sessions": list(self._slots.items()), "free": self._free,
+        }
+        arrays = {
+            "counts": self.counts, "values": self.values, "total_counts": self.total_counts,
+            "is_ucb": self._is_ucb, "epsilons": self._epsilons,
+        }
+        save_snapshot(path, type(self).__name__, meta, arrays)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Recria o armazém salvo com save(). Com mmap=True as matrizes são
+        mapeadas do arquivo (copy-on-write), sem cópia.
+        """
+        _, meta, arrays = load_snapshot(path, mmap=mmap, kind=cls.__name__)
+        store = cls(meta["n_arms"], max_sessions=0, policy=meta["policy"], epsilon=meta["epsilon"])
+        store.max_sessions = meta["max_sessions"]
+        store.rng.bit_generator.state = meta["rng"]
+        store.evictions = meta["evictions"]
+        store.counts = arrays["counts"]
+        store.values = arrays["values"]
+        store.total_counts = arrays["total_counts"]
+        store._is_ucb = arrays["is_ucb"]
+        store._epsilons = arrays["epsilons"]
+        store._slots = OrderedDict((sid, slot) for sid, slot in meta["sessions"])
+        store._free = meta["free"]
+        return store
@@ -0,0 +1,106 @@
+"""
+Formato binário de snapshots (estado de recomendadores, ambientes e
+simulações em andamento).
+
+Layout do arquivo:
+
+    8 bytes   MAGIC (b"BANDSNAP")
+    4 bytes   versão do formato (uint32, little-endian)
+    4 bytes   tamanho do cabeçalho (uint32, little-endian)
+    ...       cabeçalho JSON (utf-8): kind, meta e a lista de arrays
+              (nome, dtype, shape, offset)
+    ...       buffers crus de cada array, alinhados em ALIGN bytes
+
+Como os arrays ficam crus e alinhados, load_snapshot(mmap=True) os abre
+como memmap em modo 'c' (copy-on-write): nada é lido até ser usado e
+escritas ficam só na memória do processo.
+"""
+import json
+import os
+
+import numpy as np
+
+
+MAGIC = b"BANDSNAP"
+VERSION = 1
+ALIGN = 64
+_PREFIX = len(MAGIC) + 8
+
+
+def _aligned(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def save_snapshot(path, kind, meta=None, arrays=None):
+    """
+    Grava um snapshot em 'path'. meta: dicionário JSON; arrays: dicionário
+    nome -> numpy array. A escrita é atômica (arquivo temporário + rename),
+    então um snapshot antigo nunca fica pela metade.
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in (arrays or {}).items()}
+    entries = [{"name": name, "dtype": a.dtype.str, "shape": list(a.shape)}
+               for name, a in arrays.items()]
+
+    # O offset dos dados depende do tamanho do cabeçalho, que depende dos
+    # offsets: reserva espaço fixo para eles antes de medir
+    for entry in entries:
+        entry["offset"] = 0
+    header = {"kind": kind, "meta": meta or {}, "arrays": entries}
+    header_size = len(json.dumps(header).encode("utf-8")) + 20 * len(entries) + 16
+    offset = _aligned(_PREFIX + header_size)
+    for entry, a in zip(entries, arrays.values()):
+        entry["offset"] = offset
+        offset = _aligned(offset + a.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.array([VERSION, header_size], dtype="<u4").tobytes())
+        f.write(header_bytes)
+        for entry, a in zip(entries, arrays.values()):
+            f.seek(entry["offset"])
+            f.write(a.tobytes())
+        f.truncate(offset)
+    os.replace(tmp, path)
+
+
+def load_snapshot(path, mmap=True, kind=None):
+    """
+    Lê um snapshot e retorna (kind, meta, arrays). Com mmap=True os arrays
+    são memmaps copy-on-write (restauração sem cópia); com mmap=False são
+    copiados para a memória. Se 'kind' for dado, confere o tipo gravado.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX)
+        if prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} não é um snapshot (cabeçalho inválido).")
+        version, header_size = np.frombuffer(prefix[len(MAGIC):], dtype="<u4")
+        if version > VERSION:
+            raise ValueError(f"Snapshot na versão {version}; esta versão lê até a {VERSION}.")
+        header = json.loads(f.read(int(header_size)).decode("utf-8"))
+        if kind is not None and header["kind"] != kind:
+            raise ValueError(f"Snapshot de {header['kind']}, não de {kind}.")
+
+        arrays = {}
+        for entry in header["arrays"]:
+            dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+            count = int(np.prod(shape))
+            if mmap and count > 0:
+                arrays[entry["name"]] = np.memmap(path, dtype=dtype, mode="c",
+                                                  offset=entry["offset"], shape=shape)
+            else:
+                f.seek(entry["offset"])
+                arrays[entry["name"]] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+
+    return header["kind"], header["meta"], arrays
+
+
+def load_into(obj, path, mmap=True):
+    """
+    Restaura em 'obj' (recomendador ou ambiente) o estado salvo por
+    save_snapshot(path, type(obj).__name__, *obj._snapshot_state()).
+    """
+    _, meta, arrays = load_snapshot(path, mmap=mmap, kind=type(obj).__name__)
+    obj._restore_state(meta, arrays)
+    return obj
@@ -0,0 +1,92 @@
+from numpy import zeros, argmax, asarray, bincount
+from numpy.random import default_rng
+
+from .snapshot import load_snapshot, save_snapshot
+
+
+class ThompsonSamplingRecommender:
+    """
+    Algoritmo Thompson Sampling (Beta-Bernoulli).
+
+    Cada gênero tem uma distribuição Beta(alpha + likes, beta + dislikes)
+    para a sua probabilidade de like. A cada rodada sorteia-se um valor de
+    cada distribuição e recomenda-se o gênero com o maior sorteio: gêneros
+    incertos às vezes sorteiam valores altos (exploração) e os bons quase
+    sempre vencem (explotação).
+
+    Os K sorteios de uma rodada saem de uma única chamada ao gerador, e
+    select_arms(n) sorteia a matriz (n x K) de uma vez. Além de counts e
+    values (como nos outros recomendadores), guarda a soma exata dos likes
+    de cada gênero, usada nos parâmetros da Beta.
+    """
+    def __init__(self, n_arms, alpha=1.0, beta=1.0, rng=None):
+        self.n_arms = n_arms
+        self.rng = default_rng(rng)  # Gerador próprio (semente, Generator ou None)
+        self.alpha = alpha  # Priori Beta(alpha, beta); (1, 1) = uniforme
+        self.beta = beta
+        self.counts = zeros(n_arms)  # Número de vezes que cada gênero foi recomendado
+        self.values = zeros(n_arms)  # Média de likes de cada gênero
+        self.likes = zeros(n_arms)  # Likes de cada gênero (dislikes = counts - likes)
+
+    def _posterior(self):
+        return self.alpha + self.likes, self.beta + self.counts - self.likes
+
+    def select_arm(self):
+        return argmax(self.rng.beta(*self._posterior()))
+
+    def select_arms(self, n):
+        # n recomendações de uma vez: sorteia a matriz (n x K) numa chamada só
+        a, b = self._posterior()
+        return argmax(self.rng.beta(a, b, size=(n, self.n_arms)), axis=1)
+
+    def update(self, chosen_arm, reward):
+        self.counts[chosen_arm] += 1
+        n = self.counts[chosen_arm]
+        value = self.values[chosen_arm]
+        self.values[chosen_arm] = ((n - 1) / n) * value + (1 / n) * reward
+        self.likes[chosen_arm] += reward
+
+    def update_batch(self, chosen_arms, rewards):
+        # Aplica um lote de recompensas de uma vez (mesmo resultado de
+        # chamar update() em sequência para cada par braço/recompensa)
+        chosen_arms = asarray(chosen_arms, dtype=int)
+        n_new = bincount(chosen_arms, minlength=self.n_arms)
+        reward_sums = bincount(chosen_arms, weights=rewards, minlength=self.n_arms)
+        updated = n_new > 0
+        self.counts[updated] += n_new[updated]
+        self.values[updated] += (
+            reward_sums[updated] - n_new[updated] * self.values[updated]
+        ) / self.counts[updated]
+        self.likes += reward_sums
+
+    # ---------- Snapshots ----------
+
+    def _snapshot_state(self):
+        meta = {"n_arms": self.n_arms, "alpha": self.alpha, "beta": self.beta,
+                "rng": self.rng.bit_generator.state}
+        return meta, {"counts": self.counts, "values": self.values, "likes": self.likes}
+
+    def _restore_state(self, meta, arrays):
+        self.alpha, self.beta = meta["alpha"], meta["beta"]
+        self.rng.bit_generator.state = meta["rng"]
+        self.counts = arrays["counts"]
+        self.values = arrays["values"]
+        self.likes = arrays["likes"]
+
+    def save(self, path):
+        """
+        Grava counts, values, likes, a priori e o estado do gerador num
+        snapshot binário (veja snapshot.py).
+        """
+        save_snapshot(path, type(self).__name__, *self._snapshot_state())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Recria o recomendador salvo com save(). Com mmap=True os arrays são
+        mapeados do arquivo (copy-on-write), sem cópia.
+        """
+        _, meta, arrays = load_snapshot(path, mmap=mmap, kind=cls.__name__)
+        policy = cls(meta["n_arms"])
+        policy._restore_state(meta, arrays)
+        return policy
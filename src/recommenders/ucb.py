@@ -1,28 +1,259 @@
-from numpy import zeros, random, sqrt, log, argmax, sum
+from array import array
+from heapq import heapify, heappop, heappush
+
+from numpy import zeros, sqrt, log, argmax, asarray, bincount, full, flatnonzero, spacing
+from numpy.random import default_rng
+
+from .snapshot import load_snapshot, save_snapshot
 
 
 class UCBRecommender:
     """
     Algoritmo UCB1 (Upper Confidence Bound).
+
+    indexed=True ativa um modo indexado para catálogos grandes (ex.: músicas
+    em vez de gêneros): braços nunca testados são percorridos por um
+    cursor e os demais ficam num heap de limites superiores do UCB,
+    reavaliados só quando chegam ao topo. A escolha fica sublinear em
+    n_arms e retorna o mesmo braço do modo denso. O índice custa 8 bytes
+    por braço (versões), mais as entradas dos braços já testados.
     """
-    def __init__(self, n_arms):
+    def __init__(self, n_arms, indexed=False, rng=None):
         self.n_arms = n_arms
+        self.rng = default_rng(rng)  # Gerador próprio (semente, Generator ou None)
         self.counts = zeros(n_arms)  # Número de vezes que cada filme foi recomendado
         self.values = zeros(n_arms)  # Valor esperado de recompensa para cada filme
+        self.total_counts = 0  # Total de recomendações (mantido incrementalmente)
+        self.indexed = indexed
+
+        if indexed:
+            self._reset_index()
 
     def select_arm(self):
         # Algoritmo UCB1
-        total_counts = sum(self.counts)
+        total_counts = self.total_counts
         if total_counts == 0:
-            return random.randint(0, self.n_arms)  # Se nenhum filme foi selecionado ainda, escolha aleatoriamente
+            return self.rng.integers(0, self.n_arms)  # Se nenhum filme foi selecionado ainda, escolha aleatoriamente
+
+        if self.indexed and total_counts > 1:
+            return self._select_indexed(total_counts)
 
         ucb_values = self.values + sqrt(2 * log(total_counts) / (self.counts + 1e-5))  # Evitar divisão por zero
         return argmax(ucb_values)
 
+    def select_arms(self, n):
+        # n recomendações de uma vez, todas com as estimativas atuais
+        if self.total_counts == 0:
+            return self.rng.integers(0, self.n_arms, size=n)
+        return full(n, self.select_arm())
+
     def update(self, chosen_arm, reward):
         # Atualiza as estimativas do braço selecionado com base na recompensa observada
         self.counts[chosen_arm] += 1
         n = self.counts[chosen_arm]
         value = self.values[chosen_arm]
         new_value = ((n - 1) / n) * value + (1 / n) * reward
-        self.values[chosen_arm] = new_value
\ No newline at end of file
+        self.values[chosen_arm] = new_value
+        self.total_counts += 1
+
+        if self.indexed:
+            self._push(int(chosen_arm))
+
+    def update_batch(self, chosen_arms, rewards):
+        # Aplica um lote de recompensas de uma vez (mesmo resultado de
+        # chamar update() em sequência para cada par braço/recompensa)
+        chosen_arms = asarray(chosen_arms, dtype=int)
+        n_new = bincount(chosen_arms, minlength=self.n_arms)
+        reward_sums = bincount(chosen_arms, weights=rewards, minlength=self.n_arms)
+        updated = n_new > 0
+        self.counts[updated] += n_new[updated]
+        self.values[updated] += (
+            reward_sums[updated] - n_new[updated] * self.values[updated]
+        ) / self.counts[updated]
+        self.total_counts += len(chosen_arms)
+
+        if self.indexed:
+            for arm in flatnonzero(updated):
+                self._push(int(arm))
+
+    # ---------- Modo indexado ----------
+    #
+    # Braços com o mesmo número de escolhas n recebem o mesmo bônus, então a
+    # ordem entre eles depende (quase) só de values e não muda com
+    # total_counts. Cada grupo "n" guarda um heap com os values distintos e,
+    # para cada value, um heap com os braços. Um heap externo guarda, por
+    # grupo, um limite superior do UCB do seu topo calculado com um horizonte
+    # futuro (_horizon >= total_counts). Na escolha, só os grupos cujo limite
+    # ainda pode vencer são reavaliados.
+
+    def _reset_index(self):
+        # Braços nunca testados: só deixam de sê-lo, então o de menor índice
+        # só avança e basta um cursor (em vez de uma fila com todos)
+        self._next_untried = 0
+        self._version = array("q", bytes(8 * self.n_arms))
+        self._group_version = {}
+        self._rebuild()
+
+    def _upper_bound(self, arm, log_total):
+        # Mesma conta do modo denso, braço a braço
+        return self.values[arm] + sqrt(2 * log_total / (self.counts[arm] + 1e-5))
+
+    def _push(self, arm):
+        # Invalida a entrada antiga do braço e insere uma nova no grupo atual
+        self._version[arm] += 1
+        if self.total_counts > self._horizon or self._n_entries > 2 * self.n_arms + 64:
+            self._rebuild()
+            return
+
+        n, value = self.counts[arm], self.values[arm]
+        order, buckets = self._groups.setdefault(n, ([], {}))
+        is_top = not order or value >= -order[0]
+        if value not in buckets:
+            buckets[value] = []
+            heappush(order, -value)
+        heappush(buckets[value], (arm, self._version[arm]))
+        self._n_entries += 1
+        if is_top:
+            self._push_group(n)
+
+    def _clean_top(self, n):
+        # Descarta entradas desatualizadas do topo do grupo n e retorna o
+        # heap de braços do maior value (ou None se o grupo esvaziou)
+        order, buckets = self._groups[n]
+        while order:
+            bucket = buckets[-order[0]]
+            while bucket and bucket[0][1] != self._version[bucket[0][0]]:
+                heappop(bucket)
+                self._n_entries -= 1
+            if bucket:
+                return bucket
+            del buckets[-heappop(order)]
+        return None
+
+    def _push_group(self, n):
+        # Reinsere o grupo n no heap externo, com o limite do seu topo atual
+        self._group_version[n] = self._group_version.get(n, 0) + 1
+        bucket = self._clean_top(n)
+        if bucket is None:
+            del self._groups[n]
+            return
+        arm = bucket[0][0]
+        bound = self._upper_bound(arm, self._log_horizon)
+        heappush(self._group_heap, (-bound, arm, n, self._group_version[n]))
+
+    def _rebuild(self):
+        # Dobra o horizonte: o UCB só cresce com total_counts, então os
+        # limites calculados com o horizonte continuam válidos até lá.
+        # Também descarta as entradas desatualizadas acumuladas nos heaps.
+        self._horizon = max(2 * self.total_counts, 2)
+        self._log_horizon = log(self._horizon)
+        self._groups = {}
+        self._group_heap = []
+        self._n_entries = 0
+
+        tried = flatnonzero(self.counts > 0)
+        for arm, n, value in zip(tried.tolist(), self.counts[tried].tolist(), self.values[tried].tolist()):
+            order, buckets = self._groups.setdefault(n, ([], {}))
+            if value not in buckets:
+                buckets[value] = []
+                order.append(-value)
+            buckets[value].append((arm, self._version[arm]))  # Já em ordem de braço
+            self._n_entries += 1
+        for order, buckets in self._groups.values():
+            heapify(order)
+        for n in list(self._groups):
+            self._push_group(n)
+
+    def _best_in_group(self, n, log_total):
+        # O topo do grupo tem o maior value, mas após somar o bônus values a
+        # poucos ulps de distância podem empatar por arredondamento (e o modo
+        # denso desempata pelo menor índice). Por isso avalia também esses
+        # vizinhos, um braço (o de menor índice) por value distinto.
+        order, buckets = self._groups[n]
+        candidates = []
+        best_arm, best_value = -1, float("-inf")
+        top_value = tolerance = None
+        while self._clean_top(n) is not None:
+            value = -order[0]
+            if top_value is not None and value < top_value - tolerance:
+                break
+            arm = buckets[value][0][0]
+            candidates.append(heappop(order))
+            ucb_value = self._upper_bound(arm, log_total)
+            if top_value is None:
+                top_value, tolerance = value, 4 * spacing(abs(ucb_value))
+            if ucb_value > best_value or (ucb_value == best_value and arm < best_arm):
+                best_arm, best_value = arm, ucb_value
+
+        for entry in candidates:
+            heappush(order, entry)
+        return best_arm, best_value
+
+    def _select_indexed(self, total_counts):
+        # Braços nunca testados têm bônus enorme: o de menor índice vence,
+        # exatamente como o argmax do modo denso
+        counts, arm = self.counts, self._next_untried
+        while arm < self.n_arms and counts[arm] > 0:
+            arm += 1
+        self._next_untried = arm
+        if arm < self.n_arms:
+            return arm
+
+        log_total = log(total_counts)
+        group_heap = self._group_heap
+        popped = []
+        best_arm, best_value = -1, float("-inf")
+
+        while group_heap:
+            neg_bound, arm, n, version = group_heap[0]
+            if version != self._group_version.get(n):
+                heappop(group_heap)  # Entrada desatualizada
+                continue
+            # Nenhum grupo restante pode superar o melhor encontrado
+            if best_value > -neg_bound:
+                break
+            heappop(group_heap)
+            popped.append(n)
+            arm, value = self._best_in_group(n, log_total)
+            if value > best_value or (value == best_value and arm < best_arm):
+                best_arm, best_value = arm, value
+
+        for n in popped:
+            self._push_group(n)
+        return best_arm
+
+    # ---------- Snapshots ----------
+
+    def _snapshot_state(self):
+        meta = {"n_arms": self.n_arms, "indexed": self.indexed, "total_counts": self.total_counts,
+                "rng": self.rng.bit_generator.state}
+        return meta, {"counts": self.counts, "values": self.values}
+
+    def _restore_state(self, meta, arrays):
+        self.rng.bit_generator.state = meta["rng"]
+        self.counts = arrays["counts"]
+        self.values = arrays["values"]
+        self.total_counts = meta["total_counts"]
+        if self.indexed:
+            self._reset_index()
+            untried = flatnonzero(self.counts == 0)
+            self._next_untried = int(untried[0]) if len(untried) else self.n_arms
+
+    def save(self, path):
+        """
+        Grava counts, values, total_counts e o estado do gerador num
+        snapshot binário (veja snapshot.py).
+        """
+        save_snapshot(path, type(self).__name__, *self._snapshot_state())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Recria o recomendador salvo com save(). Com mmap=True counts e
+        values são mapeados do arquivo (copy-on-write), sem cópia.
+        """
+        _, meta, arrays = load_snapshot(path, mmap=mmap, kind=cls.__name__)
+        policy = cls(meta["n_arms"])
+        policy.indexed = meta["indexed"]
+        policy._restore_state(meta, arrays)
+        return policy
@@ -1 +1,17 @@
-from .utils import simulate
\ No newline at end of file
+from .history import History
+from .utils import compute_counts_and_means, simulate, simulate_batch, simulate_stream
+from .sweep import POLICIES, aggregate_sweep, make_policy, run_sweep
+from .stats import QuantileSketch, ReplicaAggregator, RunningStats, cumulative_regret, replicate
+from .store import ResultStore, StoredRun
+from .cache import SimulationCache, make_key
+from .profiling import PhaseTimer
+from .replay import iter_log_chunks, replay_evaluate
+
+
+# O FeedbackPipeline depende do asyncio, que só é importado quando ele é
+# usado (mantém leve o import do núcleo).
+def __getattr__(name):
+    if name == "FeedbackPipeline":
+        from .delayed_feedback import FeedbackPipeline
+        return FeedbackPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
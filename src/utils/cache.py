@@ -0,0 +1,137 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from .store import ResultStore
+
+
+def make_key(**params):
+    """
+    Chave estável para um conjunto de parâmetros de simulação
+    (ex.: genres, probs, n_rounds, epsilon, seed).
+    """
+    payload = json.dumps(params, sort_keys=True, default=float)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class SimulationCache:
+    """
+    Cache LRU de resultados de simulação, com limite de entradas e,
+    opcionalmente, cópia em disco (ResultStore) que sobrevive a reinícios.
+
+    Cada entrada é um dicionário {nome da política: resultado} e pode
+    carregar junto objetos extras só em memória (ex.: figuras prontas).
+    É seguro usar a mesma instância em várias sessões/threads.
+
+    O índice do disco é lido uma única vez (chave -> execuções) e mantido
+    atualizado a cada put. No disco ficam no máximo max_disk_entries
+    chaves: as gravadas há mais tempo são apagadas do store.
+    """
+    def __init__(self, max_entries=32, directory=None, max_disk_entries=256):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.store = ResultStore(directory) if directory else None
+        self._entries = OrderedDict()
+        self._disk = None  # chave -> {política: entrada do índice}, em ordem de gravação
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Retorna a entrada guardada para 'key' (ou None), contando acertos e
+        falhas. Se não estiver na memória, tenta o disco.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        entry = self._load_from_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self._insert(key, entry)
+        return entry
+
+    def put(self, key, resultados, extras=None):
+        """
+        Guarda {nome: resultado} (e extras só em memória) para 'key'.
+        """
+        entry = {"resultados": resultados, "extras": extras or {}}
+        evicted = []
+        if self.store is not None:
+            runs = {
+                nome: self.store.append_run(res, config={"cache_key": key, "policy": nome})
+                for nome, res in resultados.items()
+            }
+            with self._lock:
+                evicted = self._insert_disk(key, runs)
+        with self._lock:
+            self._insert(key, entry)
+        if evicted:
+            self.store.delete(evicted)
+        return entry
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_index(self):
+        # Chamado com o lock: lê o index.jsonl só na primeira vez
+        if self._disk is None:
+            self._disk = OrderedDict()
+            for run in self.store.runs():
+                key = run["config"].get("cache_key")
+                if key is not None:
+                    self._disk.setdefault(key, {})[run["config"]["policy"]] = run
+                    self._disk.move_to_end(key)
+        return self._disk
+
+    def _insert_disk(self, key, runs):
+        # Registra as execuções de 'key' e retorna os run_ids que saíram do
+        # disco (execuções antigas da mesma chave e chaves além do limite)
+        disk = self._disk_index()
+        old = disk.pop(key, {})
+        evicted = [run["run_id"] for run in old.values()]
+        disk[key] = runs
+        while len(disk) > self.max_disk_entries:
+            removed_key, removed = disk.popitem(last=False)
+            evicted.extend(run["run_id"] for run in removed.values())
+            # A entrada em memória pode apontar para os arquivos apagados
+            self._entries.pop(removed_key, None)
+        return evicted
+
+    def _load_from_disk(self, key):
+        if self.store is None:
+            return None
+        with self._lock:
+            runs = self._disk_index().get(key)
+        if not runs:
+            return None
+        resultados = {nome: self.store.open(run) for nome, run in runs.items()}
+        return {"resultados": resultados, "extras": {}}
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+            }
@@ -0,0 +1,38 @@
+import os
+
+from ..recommenders.snapshot import load_snapshot, save_snapshot
+
+
+def save_checkpoint(path, env, algorithm, progress):
+    """
+    Grava num único snapshot o estado do algoritmo, do ambiente e o
+    progresso da simulação (rodada atual e totais acumulados).
+    """
+    env_meta, env_arrays = env._snapshot_state()
+    policy_meta, policy_arrays = algorithm._snapshot_state()
+    meta = {
+        "progress": progress,
+        "env": {"kind": type(env).__name__, "meta": env_meta},
+        "policy": {"kind": type(algorithm).__name__, "meta": policy_meta},
+    }
+    arrays = {f"env/{name}": a for name, a in env_arrays.items()}
+    arrays.update({f"policy/{name}": a for name, a in policy_arrays.items()})
+    save_snapshot(path, "SimulationCheckpoint", meta, arrays)
+
+
+def load_checkpoint(path, env, algorithm, mmap=True):
+    """
+    Se 'path' existir, restaura nele o ambiente e o algoritmo (que devem
+    ter sido criados com os mesmos parâmetros) e retorna o progresso
+    salvo; senão retorna None.
+    """
+    if not os.path.exists(path):
+        return None
+    _, meta, arrays = load_snapshot(path, mmap=mmap, kind="SimulationCheckpoint")
+    for part, obj in (("env", env), ("policy", algorithm)):
+        if meta[part]["kind"] != type(obj).__name__:
+            raise ValueError(f"Checkpoint de {meta[part]['kind']}, não de {type(obj).__name__}.")
+        prefix = f"{part}/"
+        obj._restore_state(meta[part]["meta"],
+                           {name[len(prefix):]: a for name, a in arrays.items() if name.startswith(prefix)})
+    return meta["progress"]
@@ -0,0 +1,159 @@
+import asyncio
+from collections import OrderedDict
+
+import numpy as np
+
+
+_STOP = object()  # Marca de fim da fila (enviada por close)
+
+
+class FeedbackPipeline:
+    """
+    Laço de recomendação assíncrono (asyncio) para likes que chegam
+    atrasados e fora de ordem.
+
+    - recommend() escolhe um braço e devolve (rec_id, braço); a
+      recomendação fica pendente até o like chegar.
+    - feedback(rec_id, reward) coloca o like numa fila local.
+    - run() consome a fila e aplica os likes ao algoritmo em micro-lotes
+      (update_batch) de até batch_size, ou o que tiver chegado em max_wait
+      segundos.
+
+    Recomendações sem resposta por muito tempo são descartadas quando há
+    mais de max_pending pendentes (as mais antigas primeiro).
+
+    Uso:
+        pipeline = FeedbackPipeline(UCBRecommender(8))
+        tarefa = asyncio.create_task(pipeline.run())
+        rec_id, arm = pipeline.recommend()
+        ...
+        await pipeline.feedback(rec_id, 1)
+        ...
+        await pipeline.close(tarefa)
+    """
+    def __init__(self, policy, batch_size=32, max_wait=0.05, max_pending=100_000):
+        self.policy = policy
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+
+        self._pending = OrderedDict()  # rec_id -> braço, da mais antiga à mais nova
+        self._queue = asyncio.Queue()
+        self._next_id = 0
+
+        self.issued = 0
+        self.applied = 0
+        self.dropped = 0  # rec_id desconhecido ou repetido
+        self.expired = 0  # pendentes descartadas por max_pending
+        self.batches = 0
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def _register(self, arm):
+        rec_id = self._next_id
+        self._next_id += 1
+        self._pending[rec_id] = arm
+        if len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.expired += 1
+        return rec_id
+
+    def recommend(self):
+        arm = int(self.policy.select_arm())
+        self.issued += 1
+        return self._register(arm), arm
+
+    def recommend_many(self, n):
+        # n recomendações de uma vez (select_arms), todas com as estimativas atuais
+        arms = self.policy.select_arms(n)
+        self.issued += n
+        return [(self._register(int(arm)), int(arm)) for arm in arms]
+
+    async def feedback(self, rec_id, reward):
+        await self._queue.put((rec_id, reward))
+
+    def feedback_nowait(self, rec_id, reward):
+        self._queue.put_nowait((rec_id, reward))
+
+    def _apply(self, batch):
+        arms, rewards = [], []
+        for item in batch:
+            if item is _STOP:
+                continue
+            rec_id, reward = item
+            arm = self._pending.pop(rec_id, None)
+            if arm is None:
+                self.dropped += 1
+                continue
+            arms.append(arm)
+            rewards.append(reward)
+        if arms:
+            self.policy.update_batch(np.array(arms), np.array(rewards, dtype=float))
+            self.applied += len(arms)
+            self.batches += 1
+
+    def _drain(self):
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def run(self):
+        """
+        Consome a fila até close() (ou até ser cancelado), aplicando os
+        likes em micro-lotes.
+        """
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = []
+                item = await self._queue.get()
+                deadline = loop.time() + self.max_wait
+                while item is not _STOP:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    if not self._queue.empty():
+                        item = self._queue.get_nowait()
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                self._apply(batch)
+                if item is _STOP:
+                    return
+        except asyncio.CancelledError:
+            self._apply(batch + self._drain())
+            raise
+
+    def flush(self):
+        # Aplica imediatamente tudo o que já está na fila
+        self._apply(self._drain())
+
+    async def close(self, task=None):
+        """
+        Encerra o consumidor 'task' (criado com run()) depois que ele
+        aplicar tudo o que já estava na fila.
+        """
+        if task is not None:
+            self._queue.put_nowait(_STOP)
+            await task
+        self.flush()
+
+    def stats(self):
+        return {
+            "issued": self.issued,
+            "applied": self.applied,
+            "pending": self.pending,
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "expired": self.expired,
+            "batches": self.batches,
+        }
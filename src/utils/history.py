@@ -0,0 +1,100 @@
+import numpy as np
+
+
+class History:
+    """
+    Histórico compacto de uma simulação (ou do modo ao vivo).
+
+    - gêneros escolhidos no menor tipo inteiro que comporta n_arms
+      (uint8 para até 256 gêneros);
+    - likes (0/1) guardados com 1 bit cada;
+    - cresce em blocos de tamanho fixo, sem realocar o que já foi gravado;
+    - cumulative_reward e pct_optimal são calculados só quando pedidos.
+
+    Pode ser usado no lugar do dicionário de simulate: history["rewards"],
+    history["chosen_arms"], history["cumulative_reward"] e
+    history["pct_optimal"] funcionam nas funções de src.plots.
+    """
+    KEYS = ("rewards", "chosen_arms", "cumulative_reward", "pct_optimal")
+
+    def __init__(self, n_arms, best_arm=None, chunk_size=65_536):
+        self.n_arms = n_arms
+        self.best_arm = best_arm
+        self.chunk_size = -(-chunk_size // 8) * 8  # múltiplo de 8 (bytes inteiros)
+        self.arm_dtype = np.min_scalar_type(max(n_arms - 1, 0))
+        self._arm_chunks = []
+        self._reward_chunks = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def _chunk_for(self, pos):
+        # Bloco (e posição dentro dele) da rodada pos, criando-o se preciso
+        index, offset = divmod(pos, self.chunk_size)
+        if index == len(self._arm_chunks):
+            self._arm_chunks.append(np.zeros(self.chunk_size, dtype=self.arm_dtype))
+            self._reward_chunks.append(np.zeros(self.chunk_size // 8, dtype=np.uint8))
+        return index, offset
+
+    def append(self, arm, reward):
+        index, offset = self._chunk_for(self._len)
+        self._arm_chunks[index][offset] = arm
+        if reward:
+            self._reward_chunks[index][offset >> 3] |= 1 << (7 - (offset & 7))
+        self._len += 1
+
+    def extend(self, arms, rewards):
+        arms = np.asarray(arms)
+        rewards = np.asarray(rewards)
+        done = 0
+        while done < len(arms):
+            index, offset = self._chunk_for(self._len)
+            size = min(self.chunk_size - offset, len(arms) - done)
+            self._arm_chunks[index][offset:offset + size] = arms[done:done + size]
+
+            # Reescreve os bytes afetados do bloco de likes
+            first, last = offset >> 3, (offset + size + 7) >> 3
+            packed = self._reward_chunks[index]
+            bits = np.unpackbits(packed[first:last])
+            start = offset - 8 * first
+            bits[start:start + size] = rewards[done:done + size] != 0
+            packed[first:last] = np.packbits(bits)
+
+            self._len += size
+            done += size
+
+    @property
+    def chosen_arms(self):
+        if not self._arm_chunks:
+            return np.zeros(0, dtype=self.arm_dtype)
+        return np.concatenate(self._arm_chunks)[:self._len]
+
+    @property
+    def rewards(self):
+        if not self._reward_chunks:
+            return np.zeros(0, dtype=np.uint8)
+        return np.unpackbits(np.concatenate(self._reward_chunks), count=self._len)
+
+    @property
+    def cumulative_reward(self):
+        return np.cumsum(self.rewards, dtype=np.int64)
+
+    @property
+    def pct_optimal(self):
+        if self.best_arm is None:
+            return np.full(self._len, np.nan)
+        optimal = np.cumsum(self.chosen_arms == self.best_arm)
+        return optimal / np.arange(1, self._len + 1)
+
+    @property
+    def nbytes(self):
+        return sum(c.nbytes for c in self._arm_chunks) + sum(c.nbytes for c in self._reward_chunks)
+
+    def keys(self):
+        return self.KEYS
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
@@ -0,0 +1,56 @@
+class PhaseTimer:
+    """
+    Instrumentação opcional de simulate: acumula nanossegundos e número de
+    chamadas por fase da rodada.
+
+    Fases registradas por simulate:
+    - select:  algorithm.select_arm()
+    - pull:    env.pull()
+    - update:  algorithm.update()
+    - metrics: contabilidade (likes acumulados, % do melhor gênero...)
+
+    Uso:
+        timer = PhaseTimer()
+        simulate(env, algoritmo, n_rounds=10_000, instrument=timer)
+        print(timer.report())
+    """
+    PHASES = ("select", "pull", "update", "metrics")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.total_ns = dict.fromkeys(self.PHASES, 0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+
+    def add(self, phase, elapsed_ns, calls=1):
+        self.total_ns[phase] = self.total_ns.get(phase, 0) + elapsed_ns
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+
+    def summary(self):
+        """
+        Uma linha por fase: phase, calls, total_ms, mean_ns e share
+        (fração do tempo total medido).
+        """
+        grand_total = sum(self.total_ns.values())
+        rows = []
+        for phase, total in self.total_ns.items():
+            calls = self.calls[phase]
+            rows.append({
+                "phase": phase,
+                "calls": calls,
+                "total_ms": total / 1e6,
+                "mean_ns": total / calls if calls else 0.0,
+                "share": total / grand_total if grand_total else 0.0,
+            })
+        return rows
+
+    def report(self):
+        lines = [f"{'fase':<8} {'chamadas':>10} {'total (ms)':>11} {'média (ns)':>11} {'%':>6}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['phase']:<8} {row['calls']:>10} {row['total_ms']:>11.2f} "
+                f"{row['mean_ns']:>11.0f} {row['share']:>6.1%}"
+            )
+        return "\n".join(lines)
+
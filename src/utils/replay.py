@@ -0,0 +1,140 @@
+import csv
+import os
+
+import numpy as np
+
+
+# Nomes padrão das colunas de um log de interações
+LOG_COLUMNS = {"arm": "arm", "reward": "reward", "propensity": "propensity"}
+
+
+def _csv_chunks(path, chunk_size, columns):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        has_propensity = columns["propensity"] in (reader.fieldnames or [])
+        arms, rewards, propensities = [], [], []
+        for row in reader:
+            arms.append(int(row[columns["arm"]]))
+            rewards.append(float(row[columns["reward"]]))
+            if has_propensity:
+                propensities.append(float(row[columns["propensity"]]))
+            if len(arms) == chunk_size:
+                yield _chunk(arms, rewards, propensities if has_propensity else None)
+                arms, rewards, propensities = [], [], []
+        if arms:
+            yield _chunk(arms, rewards, propensities if has_propensity else None)
+
+
+def _chunk(arms, rewards, propensities):
+    return {
+        "arm": np.asarray(arms, dtype=int),
+        "reward": np.asarray(rewards, dtype=float),
+        "propensity": None if propensities is None else np.asarray(propensities, dtype=float),
+    }
+
+
+def _array_chunks(source, chunk_size, columns):
+    # source: dicionário de arrays, StoredRun ou diretório com <coluna>.npy
+    if isinstance(source, str):
+        directory = source
+        source = {}
+        for name in columns.values():
+            path = os.path.join(directory, f"{name}.npy")
+            if os.path.exists(path):
+                source[name] = np.load(path, mmap_mode="r")
+
+    arms = source[columns["arm"]]
+    rewards = source[columns["reward"]]
+    propensities = source[columns["propensity"]] if columns["propensity"] in source.keys() else None
+    for start in range(0, len(arms), chunk_size):
+        stop = start + chunk_size
+        yield {
+            "arm": np.asarray(arms[start:stop], dtype=int),
+            "reward": np.asarray(rewards[start:stop], dtype=float),
+            "propensity": None if propensities is None else np.asarray(propensities[start:stop], dtype=float),
+        }
+
+
+def iter_log_chunks(source, chunk_size=65_536, columns=None):
+    """
+    Lê um log de interações (braço, recompensa e, opcionalmente, a
+    propensão com que o braço foi escolhido) em blocos de até chunk_size
+    registros, sem carregar o arquivo inteiro.
+
+    source pode ser:
+    - um arquivo .csv com cabeçalho (colunas arm, reward, propensity);
+    - um diretório com arm.npy, reward.npy, propensity.npy (lidos via memmap);
+    - um dicionário de arrays ou um StoredRun do ResultStore.
+
+    columns: troca os nomes das colunas, ex. {"arm": "chosen_arms",
+    "reward": "rewards"} para ler uma execução do ResultStore.
+    """
+    columns = {**LOG_COLUMNS, **(columns or {})}
+    if isinstance(source, str) and source.endswith(".csv"):
+        return _csv_chunks(source, chunk_size, columns)
+    return _array_chunks(source, chunk_size, columns)
+
+
+def replay_evaluate(policy, chunks, n_arms=None, batch_size=1):
+    """
+    Avaliação offline de uma política a partir de interações registradas.
+
+    Para cada registro, a política escolhe um braço; se ele coincide com
+    o braço registrado, a recompensa registrada é usada e a política
+    aprende com ela (update), senão o registro é descartado (replay por
+    amostragem de rejeição). Com as propensões do log também são
+    calculados os estimadores IPS e IPS auto-normalizado.
+
+    chunks: blocos de iter_log_chunks (ou qualquer iterável de blocos)
+    n_arms: usado quando o log não tem propensões (coleta uniforme, 1/K)
+    batch_size: com valores > 1, a política escolhe batch_size braços de
+        uma vez (select_arms) e aprende com os acertos em lote
+        (update_batch), bem mais rápido em logs longos
+
+    Só totais acumulados ficam em memória, qualquer que seja o tamanho do
+    log. Retorna um dicionário com n_records, n_matched, replay_reward,
+    ips_reward, ips_std_error e snips_reward.
+    """
+    n_records = n_matched = 0
+    matched_reward = 0.0
+    sum_w = sum_wr = sum_wr2 = 0.0
+
+    for chunk in chunks:
+        arms, rewards, propensities = chunk["arm"], chunk["reward"], chunk["propensity"]
+        if propensities is None:
+            if n_arms is None:
+                raise ValueError("O log não tem propensões: informe n_arms (coleta uniforme).")
+            propensities = np.full(len(arms), 1.0 / n_arms)
+
+        match = np.zeros(len(arms), dtype=bool)
+        for start in range(0, len(arms), batch_size):
+            stop = min(start + batch_size, len(arms))
+            if batch_size == 1:
+                if policy.select_arm() == arms[start]:
+                    match[start] = True
+                    policy.update(arms[start], rewards[start])
+                continue
+            hits = np.asarray(policy.select_arms(stop - start)) == arms[start:stop]
+            if hits.any():
+                match[start:stop] = hits
+                policy.update_batch(arms[start:stop][hits], rewards[start:stop][hits])
+
+        # Peso de importância: 1/propensão nos acertos, 0 nos descartes
+        weights = match / propensities
+        weighted = weights * rewards
+        n_records += len(arms)
+        n_matched += int(match.sum())
+        matched_reward += float(rewards[match].sum())
+        sum_w += float(weights.sum())
+        sum_wr += float(weighted.sum())
+        sum_wr2 += float((weighted ** 2).sum())
+
+    ips = sum_wr / n_records if n_records else np.nan
+    return {
+        "n_records": n_records,
+        "n_matched": n_matched,
+        "replay_reward": matched_reward / n_matched if n_matched else np.nan,
+        "ips_reward": ips,
+        "ips_std_error": float(np.sqrt(max(sum_wr2 / n_records - ips ** 2, 0) / n_records)) if n_records else np.nan,
+        "snips_reward": sum_wr / sum_w if sum_w else np.nan,
+    }
@@ -0,0 +1,154 @@
+import numpy as np
+
+from .utils import simulate_batch
+
+
+class RunningStats:
+    """
+    Média e variância por rodada, acumuladas réplica a réplica (Welford,
+    na versão em lote de Chan et al.). Usa memória O(n_rounds), não
+    importa quantas réplicas sejam somadas.
+    """
+    def __init__(self, n_rounds):
+        self.n = 0
+        self.mean = np.zeros(n_rounds)
+        self._m2 = np.zeros(n_rounds)
+
+    def add(self, curves):
+        """
+        curves: uma curva (T,) ou várias réplicas (R x T)
+        """
+        curves = np.atleast_2d(curves)
+        n_b = curves.shape[0]
+        mean_b = curves.mean(axis=0)
+        m2_b = ((curves - mean_b) ** 2).sum(axis=0)
+
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self._m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+
+    @property
+    def var(self):
+        if self.n < 2:
+            return np.full_like(self.mean, np.nan)
+        return self._m2 / (self.n - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+
+class QuantileSketch:
+    """
+    Quantis aproximados por rodada com memória fixa: um histograma de
+    n_bins faixas entre lo[t] e hi[t] para cada rodada t. O erro de cada
+    quantil é de no máximo (hi - lo) / n_bins.
+    """
+    def __init__(self, lo, hi, n_bins=100):
+        self.lo = np.asarray(lo, dtype=float)
+        self.hi = np.asarray(hi, dtype=float)
+        self.n_bins = n_bins
+        self.n = 0
+        self.hist = np.zeros((len(self.lo), n_bins), dtype=np.int64)
+
+    def add(self, curves):
+        """
+        curves: uma curva (T,) ou várias réplicas (R x T)
+        """
+        curves = np.atleast_2d(curves)
+        n_rounds = len(self.lo)
+        width = (self.hi - self.lo) / self.n_bins
+        bins = np.floor((curves - self.lo) / width).astype(np.int64)
+        bins = np.clip(bins, 0, self.n_bins - 1)
+        flat = (np.arange(n_rounds) * self.n_bins + bins).ravel()
+        self.hist += np.bincount(flat, minlength=n_rounds * self.n_bins).reshape(n_rounds, self.n_bins)
+        self.n += curves.shape[0]
+
+    def quantile(self, q):
+        """
+        Quantil q (entre 0 e 1) em cada rodada, interpolando dentro da faixa.
+        """
+        cum = np.cumsum(self.hist, axis=1)
+        target = q * self.n
+        idx = np.argmax(cum >= target, axis=1)
+        rows = np.arange(len(self.lo))
+        before = np.where(idx > 0, cum[rows, idx - 1], 0)
+        inside = self.hist[rows, idx]
+        frac = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0.0)
+        width = (self.hi - self.lo) / self.n_bins
+        return self.lo + (idx + frac) * width
+
+
+def cumulative_regret(env, chosen_arms):
+    """
+    Arrependimento (regret) acumulado esperado: quanto de like se perde,
+    em média, por não ter recomendado sempre o melhor gênero. Usa as
+    probabilidades verdadeiras env.probs. Aceita (T,) ou (R x T).
+    """
+    gaps = env.probs.max() - env.probs[np.asarray(chosen_arms)]
+    return np.cumsum(gaps, axis=-1)
+
+
+class ReplicaAggregator:
+    """
+    Agrega muitas réplicas de simulate/simulate_batch sem guardá-las:
+    média, desvio e quantis por rodada de cumulative_reward, pct_optimal
+    e do regret acumulado (calculado a partir de env.probs).
+    """
+    METRICS = ("cumulative_reward", "pct_optimal", "cumulative_regret")
+
+    def __init__(self, env, n_rounds, n_bins=100):
+        self.env = env
+        self.n_rounds = n_rounds
+        rounds = np.arange(1, n_rounds + 1, dtype=float)
+        gap = env.probs.max() - env.probs.min()
+        zeros = np.zeros(n_rounds)
+        # Faixas possíveis de cada métrica na rodada t (recompensas 0/1)
+        ranges = {
+            "cumulative_reward": (zeros, rounds),
+            "pct_optimal": (zeros, np.ones(n_rounds)),
+            "cumulative_regret": (zeros, np.maximum(rounds * gap, 1e-12)),
+        }
+        self.stats = {m: RunningStats(n_rounds) for m in self.METRICS}
+        self.sketches = {m: QuantileSketch(*ranges[m], n_bins=n_bins) for m in self.METRICS}
+
+    @property
+    def n(self):
+        return self.stats["cumulative_reward"].n
+
+    def add(self, result):
+        """
+        result: dicionário retornado por simulate (T,) ou simulate_batch (R x T)
+        """
+        curves = {
+            "cumulative_reward": result["cumulative_reward"],
+            "pct_optimal": result["pct_optimal"],
+            "cumulative_regret": cumulative_regret(self.env, result["chosen_arms"]),
+        }
+        for metric, values in curves.items():
+            self.stats[metric].add(values)
+            self.sketches[metric].add(values)
+
+    def band(self, metric, lower=0.05, upper=0.95):
+        """
+        (média, quantil inferior, quantil superior) por rodada.
+        """
+        sketch = self.sketches[metric]
+        return self.stats[metric].mean, sketch.quantile(lower), sketch.quantile(upper)
+
+
+def replicate(env, policy_cls, n_replicas, n_rounds, chunk_replicas=1000, rng=None,
+              n_bins=100, **policy_kwargs):
+    """
+    Roda n_replicas réplicas com simulate_batch, em blocos de até
+    chunk_replicas, e alimenta um ReplicaAggregator. A memória não
+    depende de n_replicas.
+    """
+    rng = np.random.default_rng(rng)
+    aggregator = ReplicaAggregator(env, n_rounds, n_bins=n_bins)
+    for start in range(0, n_replicas, chunk_replicas):
+        size = min(chunk_replicas, n_replicas - start)
+        aggregator.add(simulate_batch(env, policy_cls, size, n_rounds, rng=rng, **policy_kwargs))
+    return aggregator
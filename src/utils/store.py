@@ -0,0 +1,151 @@
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+
+class StoredRun:
+    """
+    Uma execução gravada no ResultStore. As colunas são abertas sob demanda
+    como memmap (somente leitura): run["cumulative_reward"][::100] lê do
+    disco só as páginas usadas, sem carregar a execução inteira na RAM.
+    """
+    def __init__(self, path, entry):
+        self.path = path
+        self.run_id = entry["run_id"]
+        self.config = entry.get("config", {})
+        self.n_rounds = entry["n_rounds"]
+        self.columns = tuple(entry["columns"])
+        self._open = {}
+
+    def __len__(self):
+        return self.n_rounds
+
+    def keys(self):
+        return self.columns
+
+    def __getitem__(self, column):
+        if column not in self.columns:
+            raise KeyError(column)
+        if column not in self._open:
+            self._open[column] = np.load(os.path.join(self.path, f"{column}.npy"), mmap_mode="r")
+        return self._open[column]
+
+    def slice(self, column, start=None, stop=None, step=None):
+        """
+        Copia para a RAM só o trecho [start:stop:step] da coluna.
+        """
+        return np.array(self[column][start:stop:step])
+
+
+class ResultStore:
+    """
+    Armazena resultados de simulação em disco, em formato colunar e
+    somente-acréscimo:
+
+        root/index.jsonl              uma linha JSON por execução
+        root/runs/<run_id>/<col>.npy  um arquivo .npy por coluna
+
+    Cada execução é gravada uma única vez e nunca alterada; a linha no
+    índice só é escrita depois que todas as colunas estão no disco.
+    Execuções só saem do store com delete().
+    """
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, "runs"), exist_ok=True)
+        self._index = os.path.join(root, "index.jsonl")
+
+    def _new_run(self):
+        run_id = uuid.uuid4().hex[:12]
+        path = os.path.join(self.root, "runs", run_id)
+        os.makedirs(path)
+        return run_id, path
+
+    def _commit(self, run_id, n_rounds, columns, config):
+        entry = {"run_id": run_id, "n_rounds": int(n_rounds),
+                 "columns": list(columns), "config": config or {}}
+        with open(self._index, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def append(self, result, config=None):
+        """
+        Grava um resultado (dicionário de simulate ou History) e retorna o
+        run_id. config: metadados JSON (parâmetros da simulação, semente...).
+        """
+        return self.append_run(result, config)["run_id"]
+
+    def append_run(self, result, config=None):
+        """
+        Como append, mas retorna a entrada do índice da execução gravada
+        (para quem mantém o próprio índice em memória, sem reler o arquivo).
+        """
+        run_id, path = self._new_run()
+        columns = list(result.keys())
+        n_rounds = 0
+        for column in columns:
+            values = np.asarray(result[column])
+            np.save(os.path.join(path, f"{column}.npy"), values)
+            n_rounds = len(values)
+        return self._commit(run_id, n_rounds, columns, config)
+
+    def append_stream(self, chunks, n_rounds, config=None):
+        """
+        Grava os blocos de simulate_stream diretamente em arquivos mapeados
+        em memória, sem juntar a execução inteira na RAM.
+        """
+        run_id, path = self._new_run()
+        files = {}
+        for chunk in chunks:
+            start = chunk["start"]
+            for column, values in chunk.items():
+                if column == "start":
+                    continue
+                if column not in files:
+                    files[column] = np.lib.format.open_memmap(
+                        os.path.join(path, f"{column}.npy"), mode="w+",
+                        dtype=values.dtype, shape=(n_rounds,),
+                    )
+                files[column][start:start + len(values)] = values
+        for mm in files.values():
+            mm.flush()
+        return self._commit(run_id, n_rounds, list(files), config)["run_id"]
+
+    def runs(self):
+        """
+        Lista as entradas do índice (run_id, n_rounds, columns, config).
+        """
+        if not os.path.exists(self._index):
+            return []
+        with open(self._index, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def open(self, entry):
+        """
+        StoredRun de uma entrada do índice (de runs() ou append_run()).
+        """
+        return StoredRun(os.path.join(self.root, "runs", entry["run_id"]), entry)
+
+    def load(self, run_id):
+        for entry in self.runs():
+            if entry["run_id"] == run_id:
+                return self.open(entry)
+        raise KeyError(run_id)
+
+    def delete(self, run_ids):
+        """
+        Remove execuções do store: reescreve o índice sem elas (troca
+        atômica do arquivo) e só depois apaga as colunas do disco.
+        """
+        run_ids = set(run_ids)
+        if not run_ids:
+            return
+        kept = [entry for entry in self.runs() if entry["run_id"] not in run_ids]
+        tmp = self._index + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in kept)
+        os.replace(tmp, self._index)
+        for run_id in run_ids:
+            shutil.rmtree(os.path.join(self.root, "runs", run_id), ignore_errors=True)
@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+import numpy as np
+
+from ..music_env import MusicEnvironment
+from ..recommenders import (
+    EpsilonGreedyRecommender, RandomRecommender, ThompsonSamplingRecommender, UCBRecommender,
+)
+from .utils import simulate
+
+
+# Nomes aceitos pela varredura (e pela linha de comando)
+POLICIES = {
+    "random": RandomRecommender,
+    "epsilon_greedy": EpsilonGreedyRecommender,
+    "ucb": UCBRecommender,
+    "thompson": ThompsonSamplingRecommender,
+}
+
+
+def make_policy(name, n_arms, epsilon=None, rng=None):
+    """
+    Cria a política 'name' (uma das chaves de POLICIES).
+    epsilon só é usado pelo Epsilon-Greedy.
+    """
+    if name not in POLICIES:
+        raise ValueError(f"Política desconhecida: {name}. Use uma de {sorted(POLICIES)}.")
+    if name == "epsilon_greedy":
+        return EpsilonGreedyRecommender(n_arms, epsilon=epsilon, rng=rng)
+    return POLICIES[name](n_arms, rng=rng)
+
+
+def _run_cell(genres, probs, policy, epsilon, n_rounds, seed_index, seed_seq):
+    # Executado nos processos filhos: precisa ser uma função de módulo
+    env_seed, policy_seed = seed_seq.spawn(2)
+    env = MusicEnvironment(genres, probs, rng=env_seed)
+    algorithm = make_policy(policy, env.n_arms, epsilon=epsilon, rng=policy_seed)
+    result = simulate(env, algorithm, n_rounds=n_rounds)
+    return {
+        "policy": policy,
+        "epsilon": epsilon,
+        "n_rounds": n_rounds,
+        "seed_index": seed_index,
+        "final_reward": float(result["cumulative_reward"][-1]),
+        "final_pct_optimal": float(result["pct_optimal"][-1]),
+    }
+
+
+def sweep_cells(policies, epsilons=(0.1,), horizons=(1000,), n_seeds=10):
+    """
+    Monta a grade (política x epsilon x n_rounds x semente). epsilon só
+    varia para o Epsilon-Greedy; nas outras políticas fica None.
+    """
+    cells = []
+    for policy in policies:
+        policy_epsilons = epsilons if policy == "epsilon_greedy" else (None,)
+        for epsilon in policy_epsilons:
+            for n_rounds in horizons:
+                for seed_index in range(n_seeds):
+                    cells.append((policy, epsilon, n_rounds, seed_index))
+    return cells
+
+
+def run_sweep(genres, probs, policies, epsilons=(0.1,), horizons=(1000,),
+              n_seeds=10, seed=0, max_workers=None):
+    """
+    Roda a varredura de parâmetros em paralelo (um processo por núcleo,
+    por padrão) e devolve cada célula assim que ela termina.
+
+    As sementes vêm de SeedSequence(seed).spawn(n_seeds): a semente de
+    índice i é a mesma para todas as políticas, então elas são comparadas
+    com a mesma sequência de ambientes.
+
+    Cada resultado é um dicionário com policy, epsilon, n_rounds,
+    seed_index, final_reward e final_pct_optimal.
+    """
+    # Importado aqui para não pesar o import de src.utils (multiprocessing)
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    seeds = np.random.SeedSequence(seed).spawn(n_seeds)
+    cells = sweep_cells(policies, epsilons, horizons, n_seeds)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_run_cell, list(genres), list(probs), policy, epsilon,
+                        n_rounds, seed_index, seeds[seed_index])
+            for policy, epsilon, n_rounds, seed_index in cells
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def aggregate_sweep(results, confidence=0.95):
+    """
+    Agrupa os resultados por (policy, epsilon, n_rounds) e calcula média
+    e intervalo de confiança (aproximação normal) da recompensa final e
+    da % de escolhas do melhor gênero.
+    """
+    from statistics import NormalDist
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    groups = defaultdict(list)
+    for res in results:
+        groups[(res["policy"], res["epsilon"], res["n_rounds"])].append(res)
+
+    summary = []
+    for (policy, epsilon, n_rounds), cell_results in groups.items():
+        row = {"policy": policy, "epsilon": epsilon, "n_rounds": n_rounds,
+               "n_seeds": len(cell_results)}
+        for metric in ("final_reward", "final_pct_optimal"):
+            values = np.array([res[metric] for res in cell_results])
+            half_width = z * values.std(ddof=1) / np.sqrt(len(values)) if len(values) > 1 else np.nan
+            row[f"{metric}_mean"] = float(values.mean())
+            row[f"{metric}_ci"] = (float(values.mean() - half_width), float(values.mean() + half_width))
+        summary.append(row)
+    return summary
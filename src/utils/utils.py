@@ -1,6 +1,164 @@
+from heapq import heappop, heappush
+from time import perf_counter_ns
+
 import numpy as np
 
-def simulate(env, algorithm, n_rounds=200):
+from ..music_env import CommonRandomEnvironment
+from ..recommenders import (
+    EpsilonGreedyRecommender, RandomRecommender, ThompsonSamplingRecommender, UCBRecommender,
+)
+from .checkpoint import load_checkpoint, save_checkpoint
+from .history import History
+
+
+def compute_counts_and_means(n_arms, chosen_arms, rewards):
+    """
+    A partir do histórico, calcula em O(N + K):
+    - tentativas por gênero
+    - likes por gênero
+    - média de likes por gênero (0 para gêneros nunca escolhidos)
+    """
+    chosen_arms = np.asarray(chosen_arms, dtype=int)
+    rewards = np.asarray(rewards, dtype=float)
+
+    counts = np.bincount(chosen_arms, minlength=n_arms)
+    likes = np.bincount(chosen_arms, weights=rewards, minlength=n_arms)
+    means = np.divide(likes, counts, out=np.zeros(n_arms), where=counts > 0)
+
+    return counts, likes, means
+
+
+def _best_arm(env):
+    """
+    Retorna o índice do melhor gênero (maior probabilidade verdadeira).
+
+    Só faz sentido no modo simulado: ambientes sem probabilidades
+    verdadeiras geram ValueError.
+    """
+    if not env.has_true_probs():
+        raise ValueError(
+            "simulate() precisa de um ambiente com probabilidades verdadeiras. "
+            "No modo ao vivo use o feedback da turma em vez de env.pull()."
+        )
+    return int(np.argmax(env.probs))
+
+
+def _chunk_metrics(rewards, chosen_arms, best_arm, start, total_reward, n_optimal):
+    """
+    Métricas acumuladas de um bloco de rodadas (a partir da rodada
+    'start'), continuando os totais dos blocos anteriores. Custo O(size).
+    """
+    cumulative_reward = total_reward + np.cumsum(rewards)
+    optimal = n_optimal + np.cumsum(chosen_arms == best_arm)
+    pct_optimal = optimal / np.arange(start + 1, start + len(rewards) + 1)
+    chunk = {
+        "rewards": rewards,
+        "chosen_arms": chosen_arms,
+        "cumulative_reward": cumulative_reward,
+        "pct_optimal": pct_optimal,
+    }
+    if len(rewards):
+        total_reward, n_optimal = cumulative_reward[-1], int(optimal[-1])
+    return chunk, total_reward, n_optimal
+
+
+def _no_clock():
+    return 0
+
+
+def _run_chunk(env, algorithm, best_arm, start, size, total_reward, n_optimal, instrument=None,
+               update=None):
+    """
+    Roda 'size' rodadas a partir da rodada 'start'; as métricas acumuladas
+    continuam os totais recebidos (likes e escolhas do melhor gênero) em
+    vez de somar o histórico inteiro. Custo O(size).
+
+    instrument: PhaseTimer opcional. Sem ele o relógio é uma função que
+    retorna 0, e o laço é o mesmo nos dois casos.
+    update: substitui algorithm.update (ex.: feedback atrasado). As
+    métricas sempre contam o like na rodada em que a música foi tocada.
+    """
+    clock = _no_clock if instrument is None else perf_counter_ns
+    update = algorithm.update if update is None else update
+    rewards = np.zeros(size)
+    chosen_arms = np.zeros(size, dtype=int)
+    t_select = t_pull = t_update = t_metrics = 0
+
+    for i in range(size):
+        t0 = clock()
+        arm = algorithm.select_arm()
+        t1 = clock()
+        reward = env.pull(arm)  # usa as probabilidades verdadeiras
+        t2 = clock()
+        update(arm, reward)
+        t3 = clock()
+        rewards[i] = reward
+        chosen_arms[i] = arm
+        t4 = clock()
+
+        t_select += t1 - t0
+        t_pull += t2 - t1
+        t_update += t3 - t2
+        t_metrics += t4 - t3
+
+    t0 = clock()
+    result = _chunk_metrics(rewards, chosen_arms, best_arm, start, total_reward, n_optimal)
+    t_metrics += clock() - t0
+
+    if instrument is not None:
+        instrument.add("select", t_select, size)
+        instrument.add("pull", t_pull, size)
+        instrument.add("update", t_update, size)
+        instrument.add("metrics", t_metrics, size)
+    return result
+
+
+class _DelayedFeedback:
+    """
+    Substitui algorithm.update() no laço de _run_chunk quando os likes
+    chegam atrasados: o like da rodada t fica pendente durante delays[t]
+    rodadas inteiras e só é entregue antes da escolha da rodada
+    t + 1 + delays[t] (com atraso 0, antes da rodada seguinte, como
+    update()). Os likes que já chegaram são aplicados em lotes de
+    batch_size (update_batch); com batch_size=1, um a um com update().
+    """
+    def __init__(self, algorithm, delays, batch_size):
+        self.algorithm = algorithm
+        self.delays = delays
+        self.batch_size = batch_size
+        self.t = 0  # próxima rodada
+        self._arrivals = []  # heap de (rodada de chegada, rodada, braço, like)
+        self._ready_arms = []
+        self._ready_rewards = []
+
+    def update(self, arm, reward):
+        t = self.t
+        self.t = t + 1
+        heappush(self._arrivals, (t + 1 + int(self.delays[t]), t, arm, reward))
+        while self._arrivals and self._arrivals[0][0] <= self.t:
+            _, _, ready_arm, ready_reward = heappop(self._arrivals)
+            if self.batch_size == 1:
+                self.algorithm.update(ready_arm, ready_reward)
+                continue
+            self._ready_arms.append(ready_arm)
+            self._ready_rewards.append(ready_reward)
+        if len(self._ready_arms) >= self.batch_size:
+            self.algorithm.update_batch(self._ready_arms, self._ready_rewards)
+            self._ready_arms, self._ready_rewards = [], []
+
+
+def _feedback_update(algorithm, n_rounds, feedback_delay, feedback_batch):
+    # update() a usar no laço: o do próprio algoritmo, ou um _DelayedFeedback
+    if not np.any(feedback_delay) and feedback_batch <= 1:
+        return None
+    delays = np.broadcast_to(np.asarray(feedback_delay, dtype=int), (n_rounds,))
+    if (delays < 0).any():
+        raise ValueError("feedback_delay não pode ser negativo.")
+    return _DelayedFeedback(algorithm, delays, feedback_batch).update
+
+
+def simulate(env, algorithm, n_rounds=200, compact=False, instrument=None,
+             feedback_delay=0, feedback_batch=1):
     """
     MODO 1: SIMULADO
 
@@ -12,39 +170,182 @@ def simulate(env, algorithm, n_rounds=200):
     - chosen_arms: índice do gênero escolhido em cada rodada
     - cumulative_reward: likes acumulados ao longo das rodadas
     - pct_optimal: % de vezes em que o melhor gênero foi escolhido
-                   (só é calculado se env.probs existe)
+
+    O custo é linear em n_rounds. Para horizontes muito longos,
+    prefira simulate_stream, que não guarda o histórico inteiro, ou
+    compact=True, que retorna um History (~1 byte por rodada) com as
+    mesmas chaves.
+
+    instrument: PhaseTimer opcional que acumula o tempo gasto em cada
+    fase da rodada (select, pull, update, metrics). Com None (padrão) o
+    laço roda sem cronômetro nenhum.
+
+    feedback_delay / feedback_batch: simulam likes que chegam atrasados.
+    feedback_delay é o número de rodadas que o like passa pendente (um
+    inteiro, ou um array com o atraso de cada rodada para chegadas fora
+    de ordem): com atraso d, o like da rodada t só é visto pelo
+    algoritmo na rodada t + 1 + d. feedback_batch é o tamanho dos lotes
+    aplicados ao algoritmo. Com os padrões (0 e 1) o algoritmo aprende a
+    cada rodada, como antes. Funcionam junto com compact e instrument.
+    """
+    best_arm = _best_arm(env)
+    if compact:
+        history = History(env.n_arms, best_arm=best_arm)
+        chunks = simulate_stream(env, algorithm, n_rounds, instrument=instrument,
+                                 feedback_delay=feedback_delay, feedback_batch=feedback_batch)
+        for chunk in chunks:
+            history.extend(chunk["chosen_arms"], chunk["rewards"])
+        return history
+
+    update = _feedback_update(algorithm, n_rounds, feedback_delay, feedback_batch)
+    result, _, _ = _run_chunk(env, algorithm, best_arm, 0, n_rounds, 0, 0, instrument, update)
+    return result
+
+
+def simulate_stream(env, algorithm, n_rounds=200, chunk_size=65_536, instrument=None,
+                    checkpoint=None, checkpoint_every=None, feedback_delay=0, feedback_batch=1):
     """
+    Versão em streaming de simulate: gera o histórico em blocos de até
+    'chunk_size' rodadas, para horizontes longos (10⁷+ rodadas) que não
+    cabem confortavelmente em memória.
+
+    Cada bloco é um dicionário com as mesmas chaves de simulate, mais
+    'start' (índice da primeira rodada do bloco). cumulative_reward e
+    pct_optimal continuam contando desde a rodada 0.
+
+    instrument, feedback_delay, feedback_batch: veja simulate.
+
+    checkpoint: caminho de um snapshot com o estado do algoritmo, do
+    ambiente e do progresso, regravado a cada checkpoint_every rodadas
+    (padrão: a cada bloco) depois que o bloco foi consumido. Se o arquivo
+    já existir, a simulação continua de onde parou: env e algorithm devem
+    ser criados com os mesmos parâmetros, e só os blocos que faltam são
+    gerados.
+    """
+    best_arm = _best_arm(env)
+    update = _feedback_update(algorithm, n_rounds, feedback_delay, feedback_batch)
+    if update is not None and checkpoint is not None:
+        raise ValueError(
+            "checkpoint não guarda os likes ainda pendentes: use feedback_delay=0 "
+            "e feedback_batch=1 com checkpoint."
+        )
+    total_reward = 0
+    n_optimal = 0
+    first = 0
+
+    if checkpoint is not None:
+        # Sem mmap: o mesmo arquivo é regravado a cada checkpoint
+        progress = load_checkpoint(checkpoint, env, algorithm, mmap=False)
+        if progress is not None:
+            first, total_reward, n_optimal = progress["start"], progress["total_reward"], progress["n_optimal"]
+        checkpoint_every = checkpoint_every or chunk_size
+    last_saved = first
+
+    for start in range(first, n_rounds, chunk_size):
+        size = min(chunk_size, n_rounds - start)
+        chunk, total_reward, n_optimal = _run_chunk(
+            env, algorithm, best_arm, start, size, total_reward, n_optimal, instrument, update
+        )
+        chunk["start"] = start
+        yield chunk
+
+        stop = start + size
+        if checkpoint is not None and (stop - last_saved >= checkpoint_every or stop == n_rounds):
+            progress = {"start": stop, "total_reward": float(total_reward), "n_optimal": int(n_optimal)}
+            save_checkpoint(checkpoint, env, algorithm, progress)
+            last_saved = stop
+
+
+def _select_random_batch(counts, values, t, rng, params):
+    n_replicas, n_arms = counts.shape
+    return rng.integers(0, n_arms, size=n_replicas)
+
+
+def _select_epsilon_greedy_batch(counts, values, t, rng, params):
+    n_replicas, n_arms = counts.shape
+    arms = np.argmax(values, axis=1)
+    explore = rng.random(n_replicas) < params["epsilon"]
+    arms[explore] = rng.integers(0, n_arms, size=int(explore.sum()))
+    return arms
+
+
+def _select_ucb_batch(counts, values, t, rng, params):
+    n_replicas, n_arms = counts.shape
+    # Cada réplica faz exatamente uma escolha por rodada: total de escolhas = t
+    if t == 0:
+        return rng.integers(0, n_arms, size=n_replicas)
+    ucb_values = values + np.sqrt(2 * np.log(t) / (counts + 1e-5))
+    return np.argmax(ucb_values, axis=1)
+
+
+def _select_thompson_batch(counts, values, t, rng, params):
+    # Um sorteio Beta por (réplica, braço), todos numa chamada só. Os likes
+    # são inteiros: rint tira o ruído de arredondamento de counts * values
+    likes = np.rint(counts * values)
+    alpha = params.get("alpha", 1.0) + likes
+    beta = params.get("beta", 1.0) + counts - likes
+    return np.argmax(rng.beta(alpha, beta), axis=1)
+
+
+# Seleção vetorizada (R réplicas de uma vez) para cada política suportada
+_BATCH_SELECTORS = {
+    RandomRecommender: _select_random_batch,
+    EpsilonGreedyRecommender: _select_epsilon_greedy_batch,
+    UCBRecommender: _select_ucb_batch,
+    ThompsonSamplingRecommender: _select_thompson_batch,
+}
+
+
+def simulate_batch(env, policy_cls, n_replicas=100, n_rounds=200, rng=None, **policy_kwargs):
+    """
+    Roda n_replicas simulações independentes da mesma política em paralelo
+    (em lockstep), com counts/values guardados em matrizes (R x K) e
+    sorteios de Bernoulli vetorizados.
+
+    policy_cls: RandomRecommender, EpsilonGreedyRecommender, UCBRecommender ou
+                ThompsonSamplingRecommender
+    rng: semente ou Generator usado nas escolhas das políticas
+         (os likes são sorteados pelo gerador do próprio ambiente)
+    policy_kwargs: parâmetros da política (ex.: epsilon=0.1)
+
+    Retorna o mesmo dicionário de simulate, mas com matrizes (R x T).
+    """
+    if policy_cls not in _BATCH_SELECTORS:
+        raise ValueError(f"Política sem suporte em simulate_batch: {policy_cls.__name__}")
+
+    if isinstance(env, CommonRandomEnvironment):
+        raise ValueError(
+            "simulate_batch precisa de sorteios independentes por réplica; "
+            "use um MusicEnvironment comum."
+        )
+
+    best_arm = _best_arm(env)
+    select = _BATCH_SELECTORS[policy_cls]
+    rng = np.random.default_rng(rng)
     n_arms = env.n_arms
-    rewards = np.zeros(n_rounds)
-    chosen_arms = np.zeros(n_rounds, dtype=int)
-    cumulative_reward = np.zeros(n_rounds)
-    pct_optimal = np.zeros(n_rounds)
+    replicas = np.arange(n_replicas)
 
-    if env.has_true_probs():
-        best_arm = int(np.argmax(env.probs))
-        optimal_choices = np.zeros(n_rounds)
-    else:
-        raise('Value Error')
+    counts = np.zeros((n_replicas, n_arms))
+    values = np.zeros((n_replicas, n_arms))
+    rewards = np.zeros((n_replicas, n_rounds))
+    chosen_arms = np.zeros((n_replicas, n_rounds), dtype=int)
 
     for t in range(n_rounds):
-        arm = algorithm.select_arm()
-        reward = env.pull(arm)  # usa as probabilidades verdadeiras
-        algorithm.update(arm, reward)
+        arms = select(counts, values, t, rng, policy_kwargs)
+        reward = env.pull_batch(arms).astype(float)
 
-        rewards[t] = reward
-        chosen_arms[t] = arm
-        cumulative_reward[t] = rewards[:t+1].sum()
+        # Mesma média incremental de update(), aplicada a todas as réplicas
+        counts[replicas, arms] += 1
+        n = counts[replicas, arms]
+        values[replicas, arms] += (reward - values[replicas, arms]) / n
 
-        if best_arm is not None:
-            if arm == best_arm:
-                optimal_choices[t] = 1
-            pct_optimal[t] = optimal_choices[:t+1].sum() / (t + 1)
-        else:
-            pct_optimal[t] = np.nan
+        rewards[:, t] = reward
+        chosen_arms[:, t] = arms
 
+    rounds = np.arange(1, n_rounds + 1)
     return {
         "rewards": rewards,
         "chosen_arms": chosen_arms,
-        "cumulative_reward": cumulative_reward,
-        "pct_optimal": pct_optimal,
+        "cumulative_reward": np.cumsum(rewards, axis=1),
+        "pct_optimal": np.cumsum(chosen_arms == best_arm, axis=1) / rounds,
     }